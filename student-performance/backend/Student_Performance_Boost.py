@@ -1,204 +1,345 @@
-import numpy as np
-import pandas as pd
-import seaborn as sns 
-import matplotlib.pyplot as plt
-import missingno as msno 
+"""Training pipeline for the student exam-score model.
+
+    python Student_Performance_Boost.py --data StudentPerformanceFactors.csv --out . --no-plots
+
+Writes gb_model.pkl (a GradientBoostingRegressor, or a
+HistGradientBoostingRegressor with --engine hist), feature_transformer.pkl,
+feature_names.pkl, metrics.json and drift_baseline.json into --out. Every artifact is written to a
+temporary file and renamed into place, so a running server never sees a
+half-written file.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
 
 import joblib
+import numpy as np
+import pandas as pd
 
-from sklearn.model_selection import RandomizedSearchCV, train_test_split,GridSearchCV
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import classification_report,accuracy_score,confusion_matrix,mean_absolute_error,mean_squared_error,r2_score
-from sklearn.svm import SVC
-from sklearn.ensemble import GradientBoostingClassifier
-from sklearn.ensemble import AdaBoostClassifier
-from sklearn.ensemble import ExtraTreesClassifier
-from sklearn.ensemble import VotingClassifier
-from xgboost import XGBClassifier
-from sklearn.ensemble import GradientBoostingRegressor
-
-import folium
-from folium.plugins import HeatMap
-import plotly.express as px
-# Load the dataset first to implement the model
-data = pd.read_csv(r"C:\Users\sarth\Downloads\StudentPerformanceFactors.csv")
-#To find the column which has null values in the dataset
-print(data.isnull().sum())
-
-#Storing the missing values columns under one name to effectly access them
-missing_columns = ['Teacher_Quality', 'Parental_Education_Level', 'Distance_from_Home']
-
-#Runnning a for loop for the missing values in columns and fill them with mode values
-for col in missing_columns:
-    data[col].fillna(data[col].mode()[0],inplace=True)
-
-from sklearn.preprocessing import LabelEncoder
-#List of attributes whose values can be 
-binary_columns = ['Internet_Access','Learning_Disabilities','Extracurricular_Activities']
-
-for col in binary_columns:
-    data[col] = data[col].map({'Yes':1,'No':0})
-    
-categorical_features = [
-    'Parental_Involvement', 'Access_to_Resources', 'Motivation_Level',
-    'Family_Income', 'Teacher_Quality', 'Peer_Influence',
-    'Parental_Education_Level', 'Distance_from_Home'
-]
-
-encoder = LabelEncoder()
-for col in categorical_features:
-    data[col] = encoder.fit_transform(data[col])
-    
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-# Plot the distribution of Exam Scores
-plt.figure(figsize=(8, 5))
-sns.histplot(data['Exam_Score'], bins=30, kde=True, color="blue")
-plt.title("Distribution of Exam Scores")
-plt.xlabel("Exam Score")
-plt.ylabel("Frequency")
-plt.show()
-
-
-# Scatter plot of Hours Studied vs Exam Score
-plt.figure(figsize=(8, 5))
-sns.scatterplot(x= data['Hours_Studied'], y= data['Exam_Score'], color="green")
-plt.title("Hours Studied vs. Exam Score")
-plt.xlabel("Hours Studied")
-plt.ylabel("Exam Score")
-plt.show()
-
-
-# Boxplot of Tutoring Sessions vs Exam Score
-plt.figure(figsize=(8, 5))
-sns.boxplot(x= data['Tutoring_Sessions'], y= data['Exam_Score'], palette="coolwarm")
-plt.title("Effect of Tutoring Sessions on Exam Scores")
-plt.xlabel("Number of Tutoring Sessions")
-plt.ylabel("Exam Score")
-plt.show()
-
-# Boxplot of Motivation Level vs Exam Score
-plt.figure(figsize=(8, 5))
-sns.boxplot(x= data['Motivation_Level'], y=data['Exam_Score'], palette="magma")
-plt.title("Impact of Motivation Level on Exam Scores")
-plt.xlabel("Motivation Level")
-plt.ylabel("Exam Score")
-plt.show()
-
-# List of low-importance features
-low_importance_features = ['School_Type', 'Learning_Disabilities', 'Gender', 'Extracurricular_Activities', 'Internet_Access']
-
-# Filter out columns that don't exist in the DataFrame
-existing_columns_to_drop = [col for col in low_importance_features if col in data.columns]
-
-# Drop the existing columns
-data = data.drop(columns=existing_columns_to_drop)
-
-
-
-# Create new meaningful features
-data['Study_Efficiency'] = data['Hours_Studied'] / (data['Attendance'] + 1)  # Avoid division by zero
-data['Improvement_Rate'] = data['Exam_Score'] / (data['Hours_Studied']+1)  # How much they improved
-data['Tutoring_Effect'] = data['Tutoring_Sessions'] / (data['Hours_Studied'] + 1)
-
-print(data[['Study_Efficiency','Improvement_Rate','Tutoring_Effect']].head())
-
-
-from sklearn.preprocessing import StandardScaler
-
-# List of numerical columns to scale
-numerical_features = ['Hours_Studied', 'Attendance', 'Sleep_Hours', 'Previous_Scores', 
-                      'Tutoring_Sessions', 'Physical_Activity', 'Study_Efficiency', 
-                      'Improvement_Rate', 'Tutoring_Effect']
-
-# Initialize StandardScaler
-scaler = StandardScaler()
-
-# Fit and transform numerical features
-data[numerical_features] = scaler.fit_transform(data[numerical_features])
-
-
-from sklearn.model_selection import train_test_split
-
-print(data.head(10))
-
-# Define target variable (Exam_Score) and features (X)
-X = data.drop(columns=['Exam_Score'])  # Features
-y = data['Exam_Score']  # Target variable
-
-print("🚀 Features used for training:", list(X.columns))
-joblib.dump(list(X.columns), "feature_names.pkl")  # Save feature names
-
-
-# Split into 80% training and 20% testing
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-# Train Gradient Boosting with default parameters
-gb_model = GradientBoostingRegressor(random_state=42)
-gb_model.fit(X_train, y_train)
-
-# Predict on test data
-y_pred = gb_model.predict(X_test)
-
-# Evaluate model performance
-mae = mean_absolute_error(y_test, y_pred)
-rmse = np.sqrt(mean_squared_error(y_test, y_pred))
-r2 = r2_score(y_test, y_pred)
+from features import StudentFeatureTransformer, categorical_mappings, feature_order, numerical_features
 
-# Print model evaluation results
-print("\n🚀 Gradient Boosting Model Performance:")
-print(f"Mean Absolute Error (MAE): {mae:.4f}")
-print(f"Root Mean Squared Error (RMSE): {rmse:.4f}")
-print(f"R² Score: {r2:.4f}")
 
+TARGET = 'Exam_Score'
 
-# Define the model
-gb_model = GradientBoostingRegressor(random_state=42)
+# Columns with gaps in the export; filled with the column mode
+missing_columns = ['Teacher_Quality', 'Parental_Education_Level', 'Distance_from_Home']
 
-# Define optimized hyperparameter search space
-param_dist = {
-    'n_estimators': [100, 200, 300],  # Number of boosting stages
-    'learning_rate': [0.05, 0.1, 0.15],  # Learning rate options
-    'max_depth': [3, 5, 7],  # Tree depth options
-    'min_samples_split': [2, 5, 10],  # Minimum samples required to split a node
-    'min_samples_leaf': [1, 2, 4]  # Minimum samples required in a leaf node
+# Only the model inputs and the target are read; everything else in the export
+# (School_Type, Gender, Internet_Access, ...) was dropped as low importance
+csv_dtypes = {
+    **{feature: 'category' for feature in categorical_mappings},
+    **{feature: 'float32' for feature in numerical_features},
+    TARGET: 'float32',
 }
 
-# Use RandomizedSearchCV for faster tuning
-random_search = RandomizedSearchCV(
-    gb_model, param_distributions=param_dist,
-    n_iter=10,  # Search 10 random combinations
-    cv=3,  # 3-fold cross-validation
-    scoring='r2',
-    n_jobs=-1, verbose=1, random_state=42
-)
-
-# Fit the model
-random_search.fit(X_train, y_train)
-
-# Get best model parameters
-best_params = random_search.best_params_
-print("\n✅ Best Parameters for Gradient Boosting:", best_params)
-
-# Train the final optimized model
-best_gb_model = GradientBoostingRegressor(**best_params, random_state=42)
-best_gb_model.fit(X_train, y_train)
-
-# Evaluate the optimized model
-y_pred = best_gb_model.predict(X_test)
-
-# Calculate evaluation metrics
-mae = mean_absolute_error(y_test, y_pred)
-rmse = np.sqrt(mean_squared_error(y_test, y_pred))
-r2 = r2_score(y_test, y_pred)
-
-# Print final performance
-print("\n🚀 Optimized Gradient Boosting Performance:")
-print(f"Mean Absolute Error(MAE): {mae:.4f}")
-print(f"Root Mean Squared Error (RMSE): {rmse:.4f}")
-print(f"R² Score: {r2:.4f}")
-
-joblib.dump(best_gb_model, "gb_model.pkl")
-joblib.dump(scaler, "scaler.pkl")
-joblib.dump(encoder, "encoder.pkl")
\ No newline at end of file
+
+def _count_rows(path, block_size=1 << 20):
+    # Upper bound on the data rows, for preallocating: the reader also skips blank lines
+    lines, last = 0, b'\n'
+    with open(path, 'rb') as f:
+        while block := f.read(block_size):
+            lines += block.count(b'\n')
+            last = block[-1:]
+    return max(lines + (last != b'\n') - 1, 0)
+
+
+def load_dataset(path, chunksize=100_000):
+    """Read the CSV in chunks with compact dtypes into preallocated columns.
+
+    Each chunk is copied into arrays sized from a line count of the file
+    and then dropped, so peak memory is the final DataFrame plus one chunk:
+    one float32 block for the numerics and int16 category codes for the
+    categoricals, whose categories are merged as the chunks arrive.
+    """
+    numeric_columns = [column for column, dtype in csv_dtypes.items() if dtype != 'category']
+    categorical_columns = [column for column, dtype in csv_dtypes.items() if dtype == 'category']
+    capacity = _count_rows(path)
+    # Row-major by column, so the DataFrame below wraps it without a copy
+    numeric = np.empty((len(numeric_columns), capacity), dtype=np.float32)
+    codes = np.empty((len(categorical_columns), capacity), dtype=np.int16)
+    categories = [{} for _ in categorical_columns]  # value -> code, in first-seen order
+
+    n_rows = 0
+    reader = pd.read_csv(path, usecols=list(csv_dtypes), dtype=csv_dtypes, chunksize=chunksize)
+    for chunk in reader:
+        end = n_rows + len(chunk)
+        for i, column in enumerate(numeric_columns):
+            numeric[i, n_rows:end] = chunk[column].to_numpy()
+        for i, column in enumerate(categorical_columns):
+            values = chunk[column]
+            # Chunk codes -> global codes; the trailing -1 keeps missing values (code -1) missing
+            lookup = np.array([categories[i].setdefault(value, len(categories[i])) for value in values.cat.categories]
+                              + [-1], dtype=np.int16)
+            codes[i, n_rows:end] = lookup[values.cat.codes.to_numpy()]
+        n_rows = end
+
+    data = pd.DataFrame(numeric[:, :n_rows].T, columns=numeric_columns, copy=False)
+    for i, column in enumerate(categorical_columns):
+        data.insert(list(csv_dtypes).index(column), column,
+                    pd.Categorical.from_codes(codes[i, :n_rows], categories=list(categories[i])))
+    return data
+
+
+def clean(data):
+    # To find the column which has null values in the dataset
+    print(data.isnull().sum())
+
+    # Fill the missing values with mode values
+    for col in missing_columns:
+        data[col] = data[col].fillna(data[col].mode()[0])
+    return data
+
+
+def plot_eda(data, out_dir):
+    """Save the exploratory plots as PNGs (headless, nothing is shown)."""
+    # Heavy and only needed here, so imported lazily
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plot_dir = os.path.join(out_dir, 'plots')
+    os.makedirs(plot_dir, exist_ok=True)
+
+    def save(name):
+        plt.savefig(os.path.join(plot_dir, name), bbox_inches='tight')
+        plt.close()
+
+    # Plot the distribution of Exam Scores
+    plt.figure(figsize=(8, 5))
+    sns.histplot(data[TARGET], bins=30, kde=True, color="blue")
+    plt.title("Distribution of Exam Scores")
+    plt.xlabel("Exam Score")
+    plt.ylabel("Frequency")
+    save("exam_score_distribution.png")
+
+    # Scatter plot of Hours Studied vs Exam Score
+    plt.figure(figsize=(8, 5))
+    sns.scatterplot(x=data['Hours_Studied'], y=data[TARGET], color="green")
+    plt.title("Hours Studied vs. Exam Score")
+    plt.xlabel("Hours Studied")
+    plt.ylabel("Exam Score")
+    save("hours_studied_vs_exam_score.png")
+
+    # Boxplot of Tutoring Sessions vs Exam Score
+    plt.figure(figsize=(8, 5))
+    sns.boxplot(x=data['Tutoring_Sessions'], y=data[TARGET], palette="coolwarm")
+    plt.title("Effect of Tutoring Sessions on Exam Scores")
+    plt.xlabel("Number of Tutoring Sessions")
+    plt.ylabel("Exam Score")
+    save("tutoring_sessions_vs_exam_score.png")
+
+    # Boxplot of Motivation Level vs Exam Score
+    plt.figure(figsize=(8, 5))
+    sns.boxplot(x=data['Motivation_Level'], y=data[TARGET], palette="magma")
+    plt.title("Impact of Motivation Level on Exam Scores")
+    plt.xlabel("Motivation Level")
+    plt.ylabel("Exam Score")
+    save("motivation_level_vs_exam_score.png")
+
+    print(f"📊 Plots saved to {plot_dir}")
+
+
+def evaluate(model, X_test, y_test):
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+    y_pred = model.predict(X_test)
+    return {
+        'mae': float(mean_absolute_error(y_test, y_pred)),
+        'rmse': float(np.sqrt(mean_squared_error(y_test, y_pred))),
+        'r2': float(r2_score(y_test, y_pred)),
+    }
+
+
+def print_metrics(title, metrics):
+    print(f"\n🚀 {title}:")
+    print(f"Mean Absolute Error (MAE): {metrics['mae']:.4f}")
+    print(f"Root Mean Squared Error (RMSE): {metrics['rmse']:.4f}")
+    print(f"R² Score: {metrics['r2']:.4f}")
+
+
+def build_search(engine, out_dir, n_candidates, n_jobs, random_state):
+    from tuning import (
+        SuccessiveHalvingSearch, early_stopping_hist_regressor, early_stopping_regressor,
+        hist_param_distributions
+    )
+
+    if engine == 'hist':
+        # Native categorical splits on the eight encoded categorical columns
+        categorical = [feature_order.index(feature) for feature in categorical_mappings]
+        estimator = early_stopping_hist_regressor(categorical, random_state)
+        param_distributions = hist_param_distributions
+    else:
+        estimator = early_stopping_regressor(random_state)
+        param_distributions = None
+
+    # Successive-halving search over a wide space: every candidate is trained with
+    # early stopping, fits run on all cores, and each finished fit is
+    # checkpointed so an interrupted search resumes where it stopped
+    return SuccessiveHalvingSearch(
+        estimator=estimator,
+        param_distributions=param_distributions,
+        n_candidates=n_candidates,
+        factor=3,  # Keep the best third after each rung
+        cv=3,  # 3-fold cross-validation
+        n_jobs=n_jobs,
+        random_state=random_state,
+        checkpoint_path=os.path.join(out_dir, f"{engine}_search_checkpoint.jsonl")
+    )
+
+
+def train(data, out_dir, engine='gb', n_candidates=81, n_jobs=-1, random_state=42):
+    """Fit the transformer, tune and fit the model; return (model, transformer, metrics).
+
+    ``engine`` is ``'gb'`` (exact GradientBoostingRegressor) or ``'hist'``
+    (HistGradientBoostingRegressor with native categorical support).
+    """
+    from sklearn.ensemble import GradientBoostingRegressor
+    from sklearn.model_selection import train_test_split
+
+    from tuning import n_boosting_stages
+
+    # Encoding, derived features (Study_Efficiency, Improvement_Rate, Tutoring_Effect)
+    # and scaling come from features.py, the same transformer the Flask app serves with
+    transformer = StudentFeatureTransformer().fit(data)
+
+    # Define target variable (Exam_Score) and features (X)
+    raw = transformer.transform(data)
+    if engine == 'gb':
+        # GradientBoostingRegressor fits and predicts on float32 (sklearn's tree DTYPE) anyway;
+        # casting once here saves a float32 copy per fit and drops the float64 matrix early
+        raw = raw.astype(np.float32)
+    X = pd.DataFrame(raw, columns=feature_order, index=data.index, copy=False)
+    if engine == 'hist':
+        # The app feeds this engine plain arrays, so fit it without column names
+        X = X.to_numpy()
+    y = data[TARGET].to_numpy(dtype=np.float64)
+    print("🚀 Features used for training:", list(feature_order))
+
+    # Split into 80% training and 20% testing
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=random_state)
+
+    # Train Gradient Boosting with default parameters as a reference point
+    start = time.perf_counter()
+    baseline = GradientBoostingRegressor(random_state=random_state).fit(X_train, y_train)
+    baseline_metrics = evaluate(baseline, X_test, y_test)
+    baseline_metrics['fit_seconds'] = time.perf_counter() - start
+    print_metrics("Gradient Boosting Model Performance", baseline_metrics)
+
+    search = build_search(engine, out_dir, n_candidates, n_jobs, random_state)
+    start = time.perf_counter()
+    search.fit(X_train, y_train)
+    search_seconds = time.perf_counter() - start
+    print(f"\n✅ Best Parameters ({engine}):", search.best_params_, f"(CV R²: {search.best_score_:.4f})")
+
+    # The search already fit the winner on the full training set
+    best_model = search.best_estimator_
+    print(f"Early stopping kept {n_boosting_stages(best_model)} boosting stages")
+
+    metrics = evaluate(best_model, X_test, y_test)
+    print_metrics(f"Optimized {type(best_model).__name__} Performance", metrics)
+
+    return best_model, transformer, {
+        'engine': engine,
+        'baseline': baseline_metrics,
+        'optimized': metrics,
+        'best_params': search.best_params_,
+        'n_estimators': n_boosting_stages(best_model),
+        'search_seconds': search_seconds,
+        'n_rows': int(len(data)),
+    }
+
+
+def training_baseline(data, model, transformer):
+    """Feature and prediction distributions of the training data, for the server's drift monitor."""
+    from drift import build_baseline
+
+    raw = transformer.encode(data)
+    X = transformer.scale(raw)
+    if hasattr(model, 'feature_names_in_'):
+        X = pd.DataFrame(X, columns=feature_order)
+    return build_baseline(transformer, raw, model.predict(X))
+
+
+def atomic_write(path, write):
+    """Call ``write(tmp_path)`` and rename the result over ``path`` in one step."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates owner-only files
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def json_writer(obj):
+    # A write(tmp_path) callback for atomic_write
+    def write(tmp_path):
+        with open(tmp_path, 'w') as f:
+            json.dump(obj, f, indent=2)
+    return write
+
+
+def save_artifacts(out_dir, model, transformer, metrics, baseline=None):
+    from artifacts import write_manifest
+
+    atomic_write(os.path.join(out_dir, "feature_transformer.pkl"), lambda p: joblib.dump(transformer, p))
+    atomic_write(os.path.join(out_dir, "feature_names.pkl"), lambda p: joblib.dump(list(feature_order), p))
+    atomic_write(os.path.join(out_dir, "metrics.json"), json_writer(metrics))
+    if baseline is not None:
+        atomic_write(os.path.join(out_dir, "drift_baseline.json"), json_writer(baseline))
+    atomic_write(os.path.join(out_dir, "gb_model.pkl"), lambda p: joblib.dump(model, p))
+    # The manifest goes last: a watching server only reloads once the files it lists all match it
+    write_manifest(out_dir, ["feature_transformer.pkl", "gb_model.pkl"])
+    print(f"💾 Artifacts written to {out_dir}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Train the student exam-score model.")
+    parser.add_argument('--data', required=True, help="Path to StudentPerformanceFactors.csv")
+    parser.add_argument('--out', default=os.path.dirname(os.path.abspath(__file__)),
+                        help="Directory for the model artifacts (default: next to this script)")
+    parser.add_argument('--no-plots', action='store_true', help="Skip the exploratory plots")
+    parser.add_argument('--engine', choices=['gb', 'hist'], default='gb',
+                        help="gb: exact GradientBoostingRegressor, hist: HistGradientBoostingRegressor")
+    parser.add_argument('--baseline-only', action='store_true',
+                        help="Only write drift_baseline.json for the model already in --out")
+    parser.add_argument('--chunksize', type=int, default=100_000, help="Rows per CSV chunk")
+    parser.add_argument('--n-candidates', type=int, default=81, help="Hyperparameter settings to try")
+    parser.add_argument('--n-jobs', type=int, default=-1, help="Parallel fits (-1 = all cores)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.makedirs(args.out, exist_ok=True)
+
+    start = time.perf_counter()
+    data = clean(load_dataset(args.data, chunksize=args.chunksize))
+    print(f"Loaded {len(data)} rows ({data.memory_usage(deep=True).sum() / 1e6:.1f} MB) "
+          f"in {time.perf_counter() - start:.1f}s")
+
+    if args.baseline_only:
+        model = joblib.load(os.path.join(args.out, "gb_model.pkl"))
+        transformer = joblib.load(os.path.join(args.out, "feature_transformer.pkl"))
+        baseline = training_baseline(data, model, transformer)
+        atomic_write(os.path.join(args.out, "drift_baseline.json"), json_writer(baseline))
+        print(f"💾 Drift baseline written to {args.out}")
+        return
+
+    if not args.no_plots:
+        plot_eda(data, args.out)
+
+    model, transformer, metrics = train(
+        data, args.out, engine=args.engine, n_candidates=args.n_candidates, n_jobs=args.n_jobs)
+    save_artifacts(args.out, model, transformer, metrics, training_baseline(data, model, transformer))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+import hashlib
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+
+# Model artifacts live next to this module unless MODEL_ARTIFACT_DIR says otherwise
+ARTIFACT_DIR = os.environ.get('MODEL_ARTIFACT_DIR', os.path.dirname(os.path.abspath(__file__)))
+
+# Bumped when the on-disk layout of the compiled-model cache changes
+COMPILED_CACHE_VERSION = 2
+
+# Written last by the training script: name, size and mtime of every artifact in the set
+MANIFEST_FILE = "manifest.json"
+
+
+class StartupTimer:
+    """Wall-clock time per startup stage (imports, artifact loads, warm-up)."""
+
+    def __init__(self):
+        self.stages = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    @property
+    def total(self):
+        return time.perf_counter() - self._start
+
+    def as_dict(self):
+        return {
+            "stages_ms": {name: round(seconds * 1e3, 2) for name, seconds in self.stages.items()},
+            "total_ms": round(self.total * 1e3, 2)
+        }
+
+    def report(self, stream=sys.stderr):
+        width = max(len(name) for name in self.stages) if self.stages else 0
+        print("Startup timings:", file=stream)
+        for name, seconds in self.stages.items():
+            print(f"  {name:<{width}}  {seconds * 1e3:8.1f} ms", file=stream)
+        print(f"  {'total':<{width}}  {self.total * 1e3:8.1f} ms", file=stream, flush=True)
+
+
+def fingerprint(paths):
+    # Identifies one set of artifact files by name, size and mtime
+    digest = hashlib.sha1(str(COMPILED_CACHE_VERSION).encode())
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def _file_stat(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def write_manifest(directory, names):
+    """Record the artifact files just written, so readers can tell a complete set from a partial one."""
+    import json
+    import tempfile
+
+    manifest = {name: _file_stat(os.path.join(directory, name)) for name in names}
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{MANIFEST_FILE}.", suffix=".tmp")
+    with os.fdopen(fd, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, os.path.join(directory, MANIFEST_FILE))
+
+
+def artifact_set_complete(directory, loaded_stats):
+    """Whether the files in ``directory`` form one finished set, safe to load.
+
+    With a manifest, every file it lists must still match it. Older
+    directories have none; there both the model and the transformer must
+    differ from ``loaded_stats`` (their stats when last loaded), since a
+    writer replaces the transformer before the model.
+    """
+    import json
+
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    try:
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            return all(_file_stat(os.path.join(directory, name)) == stat for name, stat in manifest.items())
+        return all(_file_stat(path) != stat for path, stat in loaded_stats.items())
+    except (OSError, ValueError):
+        return False  # Mid-replace; look again later
+
+
+class ArtifactSet:
+    """One loaded set of model artifacts.
+
+    ``predictor`` is what requests use. When a compiled model is cached on
+    disk it is memory-mapped, so every worker process shares the same
+    physical pages and the sklearn model isn't unpickled at all; ``model``
+    then loads it lazily on first access. ``source_stats`` are the source
+    files' size and mtime at load time, for ``artifact_set_complete``.
+    """
+
+    def __init__(self, directory, transformer, predictor, model_path, source_paths, model=None):
+        self.directory = directory
+        self.transformer = transformer
+        self.predictor = predictor
+        self.model_path = model_path
+        self.source_paths = source_paths
+        self.fingerprint = fingerprint(source_paths)
+        self.source_stats = {path: _file_stat(path) for path in source_paths}
+        self._model = model
+
+    @property
+    def model(self):
+        if self._model is None:
+            import joblib
+            self._model = joblib.load(self.model_path, mmap_mode='r')
+        return self._model
+
+
+def _transformer_path(directory):
+    path = os.path.join(directory, "feature_transformer.pkl")
+    return path if os.path.exists(path) else os.path.join(directory, "scaler.pkl")
+
+
+def load_artifacts(directory=ARTIFACT_DIR, timer=None, use_cache=True, allow_legacy=False):
+    """Load the transformer and a predictor for the model in ``directory``.
+
+    Artifacts from before the feature schema (a ``scaler.pkl`` instead of
+    ``feature_transformer.pkl``) are schema 1 and rejected unless
+    ``allow_legacy`` is set, in which case they load with a warning.
+    """
+    import joblib
+
+    from compiled_model import CompiledGradientBoosting, build_predictor
+    from features import StudentFeatureTransformer, feature_order, scaled_features
+
+    timer = timer or StartupTimer()
+    directory = os.path.abspath(directory)
+    model_path = os.path.join(directory, "gb_model.pkl")
+    transformer_path = _transformer_path(directory)
+    source_paths = [model_path, transformer_path]
+
+    with timer.stage("load feature transformer"):
+        if transformer_path.endswith("feature_transformer.pkl"):
+            transformer = joblib.load(transformer_path)
+        else:
+            # Artifacts from before the shared transformer: rebuild it from the fitted scaler
+            transformer = StudentFeatureTransformer.from_scaler(joblib.load(transformer_path))
+        legacy = allow_legacy and transformer.schema_version_ == 1
+        if legacy:
+            print(f"Serving legacy (schema 1) artifacts from {directory}; their derived features differ "
+                  f"from what the API computes. Retrain with Student_Performance_Boost.py.", file=sys.stderr)
+        elif transformer.schema_version_ == 1:
+            raise ValueError(f"{directory} holds legacy (schema 1) artifacts: retrain with Student_Performance_Boost.py, "
+                             f"or load them with allow_legacy (ALLOW_LEGACY_MODEL=1 for the app)")
+        else:
+            # Also on the compiled-cache path, which never loads the model for check_model
+            transformer.check_schema()
+
+    cache_dir = os.path.join(directory, ".compiled")
+    cache_path = os.path.join(cache_dir, f"{fingerprint(source_paths)}.joblib")
+
+    if use_cache and os.path.exists(cache_path):
+        with timer.stage("map compiled model"):
+            predictor = CompiledGradientBoosting.load(cache_path, mmap_mode='r')
+        return ArtifactSet(directory, transformer, predictor, model_path, source_paths)
+
+    with timer.stage("load model"):
+        model = joblib.load(model_path, mmap_mode='r')
+        transformer.check_model(model, schema=not legacy)
+
+    with timer.stage("compile model"):
+        predictor = build_predictor(model, transformer, feature_order, scaled_features)
+
+    if use_cache and isinstance(predictor, CompiledGradientBoosting):
+        with timer.stage("write compiled cache"):
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+                predictor.save(tmp_path)
+                os.replace(tmp_path, cache_path)
+                # Re-open mapped so this process shares pages with the other workers
+                predictor = CompiledGradientBoosting.load(cache_path, mmap_mode='r')
+            except OSError as e:
+                print(f"Compiled model cache not written ({e}); continuing without it", file=sys.stderr)
+
+    # The compiled trees are all serving needs; don't keep the sklearn model alive next to them
+    return ArtifactSet(directory, transformer, predictor, model_path, source_paths,
+                       model=None if isinstance(predictor, CompiledGradientBoosting) else model)
+
+
+# A plausible student used to exercise every code path before serving traffic
+warm_up_student = {
+    "Hours_Studied": 20, "Attendance": 80, "Sleep_Hours": 7, "Previous_Scores": 75,
+    "Tutoring_Sessions": 1, "Physical_Activity": 3,
+    "Parental_Involvement": "Medium", "Access_to_Resources": "Medium", "Motivation_Level": "Medium",
+    "Family_Income": "Medium", "Teacher_Quality": "Medium", "Peer_Influence": "Neutral",
+    "Parental_Education_Level": "College", "Distance_from_Home": "Near"
+}
+
+
+def warm_up(artifacts, batch_size=64):
+    """Run single-row and batch predictions once so the first request pays no setup cost."""
+    import numpy as np
+
+    encoded, error = artifacts.transformer.validate_row(warm_up_student)
+    if error:
+        raise RuntimeError(f"Warm-up row rejected: {error}")
+    raw = artifacts.transformer.encode_rows([encoded] * batch_size)
+
+    single = artifacts.predictor.predict_one(raw[0])
+    batch = artifacts.predictor.predict(raw)
+    if not np.all(np.isfinite(batch)) or batch[0] != single:
+        raise RuntimeError("Warm-up predictions are inconsistent; refusing to serve this model")
+    return single
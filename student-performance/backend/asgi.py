@@ -0,0 +1,24 @@
+"""ASGI entry point with micro-batching enabled.
+
+    pip install uvicorn a2wsgi
+    uvicorn asgi:application --host 0.0.0.0 --port 5000
+
+The event loop accepts and parses connections; the Flask views run on a
+pool of ASGI_THREADS threads, where concurrent /predict and /add_student
+calls wait on the shared micro-batchers instead of each paying for its own
+model call and commit. Tune the windows with PREDICT_BATCH_MAX_ROWS,
+PREDICT_BATCH_WAIT_MS, WRITE_BATCH_MAX_ROWS and WRITE_BATCH_WAIT_MS, and
+watch micro_batch_size on /metrics. Request and response formats are the
+same as under the WSGI server.
+"""
+import os
+
+os.environ.setdefault('MICRO_BATCHING', '1')
+
+from a2wsgi import WSGIMiddleware  # noqa: E402
+
+from app import app  # noqa: E402
+
+# Threads bound how many requests can be waiting on a batch at once, so keep
+# this at least PREDICT_BATCH_MAX_ROWS for full batches
+application = WSGIMiddleware(app, workers=int(os.environ.get('ASGI_THREADS', 256)))
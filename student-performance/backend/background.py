@@ -0,0 +1,36 @@
+import os
+import threading
+
+
+class ProcessLocalThread:
+    """A daemon thread started lazily, at most once per process.
+
+    Threads don't survive fork, so objects created at import time by a
+    pre-forking server call ``ensure_started`` on use: each worker process
+    starts its own thread, and one that died is started again.
+    ``on_start`` runs under the lock before the thread starts, e.g. to
+    replace state inherited from the parent process.
+    """
+
+    def __init__(self, target, name, on_start=None):
+        self.target = target
+        self.name = name
+        self.on_start = on_start
+        self._lock = threading.Lock()
+        self._pid = None
+        self._thread = None
+
+    def _running(self):
+        return self._pid == os.getpid() and self._thread.is_alive()
+
+    def ensure_started(self):
+        if self._running():
+            return
+        with self._lock:
+            if self._running():
+                return
+            if self.on_start is not None:
+                self.on_start()
+            self._thread = threading.Thread(target=self.target, name=self.name, daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
@@ -0,0 +1,333 @@
+"""Load test: throughput and latency percentiles per API endpoint.
+
+By default the app is started in a separate process (so it doesn't share
+the GIL with the load threads) on a local port against a fresh SQLite
+database (DATABASE_URL stand-in for MySQL), seeded with synthetic students
+through /students/import, and each endpoint is then driven by concurrent
+HTTP clients. With --url the same scenarios run against an already running
+server instead.
+
+Run from the backend directory:
+
+    python benchmarks/bench_api.py --students 5000 --concurrency 8 --duration 10 --json api.json
+    python benchmarks/bench_api.py --rate 200 --endpoints predict add_student
+    python benchmarks/bench_api.py --micro-batching --concurrency 64 --endpoints predict add_student
+
+--rate 0 (the default) is closed-loop: every client sends its next request
+as soon as the previous one returns. With --rate N requests are scheduled
+at N per second and latency is measured from the scheduled send time, so
+queueing under overload shows up in the percentiles.
+
+/predict and /predict_batch send a freshly drawn student per row, so they
+measure the model rather than the prediction cache; --cached-predict
+draws from the seeded students instead, which mostly hits the cache.
+"""
+import argparse
+import atexit
+import http.client
+import itertools
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from features import categorical_mappings, numerical_features  # noqa: E402
+
+
+# Plausible ranges for the synthetic students (roughly the training data's)
+numerical_ranges = {
+    "Hours_Studied": (1, 44), "Attendance": (60, 100), "Sleep_Hours": (4, 10),
+    "Previous_Scores": (50, 100), "Tutoring_Sessions": (0, 8), "Physical_Activity": (0, 6),
+}
+
+
+def synthetic_student(rng):
+    student = {}
+    for feature in numerical_features:
+        low, high = numerical_ranges[feature]
+        student[feature] = int(rng.integers(low, high + 1))
+    for feature, values in categorical_mappings.items():
+        student[feature] = values[rng.integers(len(values))]
+    return student
+
+
+def synthetic_students(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [{"name": f"Student {i:07d}", **synthetic_student(rng)} for i in range(n)]
+
+
+def api_fields(student):
+    # add_student takes the lowercased column names
+    return {key.lower(): value for key, value in student.items()}
+
+
+class Client:
+    """One keep-alive HTTP connection; each load thread has its own."""
+
+    def __init__(self, base_url, token=None):
+        parts = urlsplit(base_url)
+        self.conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        self.headers = {"Content-Type": "application/json"}
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+
+    def request(self, method, path, body=None):
+        try:
+            self.conn.request(method, path, body=None if body is None else json.dumps(body), headers=self.headers)
+            response = self.conn.getresponse()
+            data = response.read()
+        except (http.client.HTTPException, OSError):
+            self.conn.close()
+            raise
+        return response.status, data
+
+
+# First line the server process prints on stdout once it accepts connections
+READY_PREFIX = "bench-server listening on port "
+
+
+def serve(database_path):
+    """Server process: import the app against a SQLite file and serve it on a free local port."""
+    os.environ['DATABASE_URL'] = f"sqlite:///{database_path}"
+    from werkzeug.serving import make_server
+
+    import app as app_module
+
+    with app_module.app.app_context():
+        app_module.ensure_schema()
+
+    # Per-request access logging would dominate the measurements
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app_module.app, threaded=True)
+    print(f"{READY_PREFIX}{server.server_port}", flush=True)
+    server.serve_forever()
+
+
+def start_local_server(database_path, micro_batching=False):
+    """Run ``serve`` in a child process; returns the process and its base URL."""
+    env = dict(os.environ, MODEL_WATCH_INTERVAL=os.environ.get('MODEL_WATCH_INTERVAL', '0'))
+    if micro_batching:
+        env['MICRO_BATCHING'] = '1'
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--serve', database_path],
+                               cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE, text=True)
+    for line in process.stdout:
+        if line.startswith(READY_PREFIX):
+            # Keep draining stdout so a chatty app never blocks on a full pipe
+            threading.Thread(target=process.stdout.read, name="bench-server-stdout", daemon=True).start()
+            return process, f"http://127.0.0.1:{int(line[len(READY_PREFIX):])}"
+    raise RuntimeError(f"Server process exited with code {process.wait()} before listening")
+
+
+def login(base_url):
+    client = Client(base_url)
+    credentials = {"email": f"bench-{os.getpid()}-{time.time_ns()}@example.com", "password": "bench-password"}
+    client.request("POST", "/register", credentials)
+    status, data = client.request("POST", "/login", credentials)
+    if status != 200:
+        raise RuntimeError(f"Login failed ({status}): {data[:200]}")
+    return json.loads(data)["access_token"]
+
+
+def seed(base_url, token, students):
+    client = Client(base_url, token)
+    status, data = client.request("POST", "/students/import", students)
+    if status != 202:
+        raise RuntimeError(f"Import failed ({status}): {data[:200]}")
+    job_id = json.loads(data)["job_id"]
+    while True:
+        job = json.loads(client.request("GET", f"/students/import/{job_id}")[1])
+        if job["status"].startswith("completed"):
+            return job
+        time.sleep(0.2)
+
+
+def scenarios(students, id_range, batch_size, cached_predict=False):
+    """Endpoint name -> function(rng) returning (method, path, body)."""
+    low_id, high_id = id_range
+    names = [student["name"] for student in students]
+
+    def pick(rng):
+        return students[rng.integers(len(students))]
+
+    def features(rng):
+        # A new student almost never repeats, so it misses the prediction cache
+        if not cached_predict:
+            return synthetic_student(rng)
+        return {k: v for k, v in pick(rng).items() if k != "name"}
+
+    return {
+        "predict": lambda rng: ("POST", "/predict", features(rng)),
+        "predict_batch": lambda rng: ("POST", "/predict_batch", [features(rng) for _ in range(batch_size)]),
+        "add_student": lambda rng: ("POST", "/add_student", api_fields(pick(rng))),
+        "student": lambda rng: ("GET", f"/student?id={rng.integers(low_id, high_id + 1)}", None),
+        "student_by_name": lambda rng: ("GET", "/student?" + urlencode({"name": names[rng.integers(len(names))]}), None),
+        "students": lambda rng: ("GET", "/students?" + urlencode({
+            "limit": 50, "sort": "-predicted_score",
+            "motivation_level": categorical_mappings["Motivation_Level"][rng.integers(3)]}), None),
+    }
+
+
+def run_load(base_url, token, make_request, concurrency, duration, rate, seed_value=0):
+    """Drive one scenario; returns latencies (seconds), error count and wall time."""
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    counter = itertools.count()
+    start = time.perf_counter()
+    deadline = start + duration
+
+    def worker(worker_id):
+        client = Client(base_url, token)
+        rng = np.random.default_rng(seed_value * 1000 + worker_id)
+        local = []
+        local_errors = 0
+        while True:
+            if rate:
+                # Open loop: request i is due at start + i / rate, whoever sends it
+                scheduled = start + next(counter) / rate
+                if scheduled >= deadline:
+                    break
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            else:
+                scheduled = time.perf_counter()
+                if scheduled >= deadline:
+                    break
+            method, path, body = make_request(rng)
+            try:
+                status, _ = client.request(method, path, body)
+                ok = status < 400
+            except (http.client.HTTPException, OSError):
+                client = Client(base_url, token)
+                ok = False
+            local.append(time.perf_counter() - scheduled)
+            local_errors += not ok
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.array(latencies), errors[0], time.perf_counter() - start
+
+
+def summarize(endpoint, latencies, errors, wall):
+    if not len(latencies):
+        return {"endpoint": endpoint, "requests": 0, "errors": errors}
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1e3
+    return {
+        "endpoint": endpoint,
+        "requests": int(len(latencies)),
+        "errors": int(errors),
+        "throughput_rps": len(latencies) / wall,
+        "mean_ms": float(latencies.mean() * 1e3),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "max_ms": float(latencies.max() * 1e3),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=BACKEND_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help="Benchmark a running server instead of starting one on SQLite")
+    parser.add_argument('--micro-batching', action='store_true',
+                        help="Coalesce concurrent /predict and /add_student calls in the local server")
+    parser.add_argument('--database', help="SQLite file for the local server (default: a temporary file)")
+    parser.add_argument('--students', type=int, default=5000, help="Synthetic students to seed")
+    parser.add_argument('--endpoints', nargs='+',
+                        default=['predict', 'predict_batch', 'add_student', 'student', 'student_by_name', 'students'])
+    parser.add_argument('--concurrency', type=int, default=8, help="Client threads")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds per endpoint")
+    parser.add_argument('--rate', type=float, default=0, help="Requests per second (0 = closed loop)")
+    parser.add_argument('--batch-size', type=int, default=100, help="Rows per /predict_batch request")
+    parser.add_argument('--cached-predict', action='store_true',
+                        help="Predict the seeded students (mostly cache hits) instead of fresh ones")
+    parser.add_argument('--warmup', type=float, default=1.0, help="Unrecorded seconds before each endpoint")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="Also write the results to this file")
+    parser.add_argument('--serve', metavar='DATABASE', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        return serve(args.serve)
+
+    if args.url:
+        base_url = args.url.rstrip('/')
+    else:
+        database = args.database or os.path.join(tempfile.mkdtemp(prefix="bench-api-"), "students.db")
+        server, base_url = start_local_server(database, args.micro_batching)
+        # Also on errors and Ctrl-C, so no server process is left behind
+        atexit.register(server.terminate)
+        print(f"Serving on {base_url} with SQLite database {database}"
+              + (" (micro-batching)" if args.micro_batching else ""))
+
+    token = login(base_url)
+    students = synthetic_students(args.students, args.seed)
+    start = time.perf_counter()
+    job = seed(base_url, token, students)
+    print(f"Seeded {job['inserted']} students in {time.perf_counter() - start:.1f}s")
+
+    # Student ids for /student lookups; an import gets consecutive ids on a fresh database
+    client = Client(base_url, token)
+    ids = [row["id"] for row in json.loads(client.request("GET", "/students?fields=id&limit=500")[1])["students"]]
+    id_range = (min(ids), min(ids) + job["inserted"] - 1) if ids else (1, 1)
+
+    available = scenarios(students, id_range, args.batch_size, args.cached_predict)
+    unknown = [endpoint for endpoint in args.endpoints if endpoint not in available]
+    if unknown:
+        parser.error(f"Unknown endpoints {unknown}; choose from {list(available)}")
+
+    results = []
+    for endpoint in args.endpoints:
+        if args.warmup:
+            run_load(base_url, token, available[endpoint], args.concurrency, args.warmup, args.rate, args.seed)
+        latencies, errors, wall = run_load(
+            base_url, token, available[endpoint], args.concurrency, args.duration, args.rate, args.seed + 1)
+        results.append(summarize(endpoint, latencies, errors, wall))
+
+    header = (f"{'endpoint':<16} {'requests':>9} {'errors':>7} {'req/s':>9} "
+              f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    print("\n" + header)
+    print("-" * len(header))
+    for r in results:
+        if not r["requests"]:
+            print(f"{r['endpoint']:<16} {0:>9} {r['errors']:>7}")
+            continue
+        print(f"{r['endpoint']:<16} {r['requests']:>9} {r['errors']:>7} {r['throughput_rps']:>9.1f} "
+              f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['max_ms']:>8.2f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                "commit": git_commit(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "target": args.url or "local sqlite",
+                "config": {key: value for key, value in vars(args).items() if key != 'json'},
+                "results": results,
+            }, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Microbenchmark: single-row /predict inference, current path vs compiled model.
+
+Run from the backend directory:
+
+    python benchmarks/bench_compiled_model.py --iterations 5000
+"""
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from compiled_model import CompiledGradientBoosting  # noqa: E402
+
+
+SAMPLE = {
+    "Hours_Studied": 20.0, "Attendance": 85.0, "Sleep_Hours": 7.0, "Previous_Scores": 75.0,
+    "Tutoring_Sessions": 2.0, "Physical_Activity": 3.0,
+    "Parental_Involvement": 1, "Access_to_Resources": 2, "Motivation_Level": 0,
+    "Family_Income": 1, "Teacher_Quality": 2, "Peer_Influence": 2,
+    "Parental_Education_Level": 1, "Distance_from_Home": 0,
+}
+
+
+def current_path(model, scaler, feature_order, scaled_features, sample):
+    # Mirrors the original predict(): DataFrame, derived columns, scaler, reindex, predict
+    input_data = pd.DataFrame([sample])
+    input_data["Study_Efficiency"] = input_data["Hours_Studied"] / (input_data["Attendance"] + 1)
+    input_data["Improvement_Rate"] = input_data["Previous_Scores"] / (input_data["Hours_Studied"] + 1)
+    input_data["Tutoring_Effect"] = input_data["Tutoring_Sessions"] / (input_data["Hours_Studied"] + 1)
+    input_data[scaled_features] = scaler.transform(input_data[scaled_features])
+    input_data = input_data[feature_order]
+    return model.predict(input_data)[0]
+
+
+def compiled_path(engine, feature_order, sample):
+    x = np.array([sample.get(feature, 0.0) for feature in feature_order], dtype=np.float64)
+    hours = sample["Hours_Studied"]
+    x[feature_order.index("Study_Efficiency")] = hours / (sample["Attendance"] + 1)
+    x[feature_order.index("Improvement_Rate")] = sample["Previous_Scores"] / (hours + 1)
+    x[feature_order.index("Tutoring_Effect")] = sample["Tutoring_Sessions"] / (hours + 1)
+    return engine.predict_one(x)
+
+
+def measure(fn, iterations, warmup=50):
+    for _ in range(warmup):
+        fn()
+    timings = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings[i] = time.perf_counter() - start
+    return timings * 1e6  # microseconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--model", default=os.path.join(BACKEND_DIR, "gb_model.pkl"))
+    parser.add_argument("--scaler", default=os.path.join(BACKEND_DIR, "scaler.pkl"))
+    args = parser.parse_args()
+
+    model = joblib.load(args.model)
+    scaler = joblib.load(args.scaler)
+    feature_order = list(model.feature_names_in_)
+    scaled_features = list(scaler.feature_names_in_)
+
+    start = time.perf_counter()
+    engine = CompiledGradientBoosting.from_estimators(model, scaler, feature_order, scaled_features)
+    print(f"compile time: {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    expected = current_path(model, scaler, feature_order, scaled_features, SAMPLE)
+    actual = compiled_path(engine, feature_order, SAMPLE)
+    print(f"bit-identical: {expected == actual} ({expected!r} vs {actual!r})")
+
+    results = {
+        "current (pandas + sklearn)": measure(
+            lambda: current_path(model, scaler, feature_order, scaled_features, SAMPLE), args.iterations),
+        "compiled": measure(lambda: compiled_path(engine, feature_order, SAMPLE), args.iterations),
+    }
+
+    print(f"\n{'path':<28}{'p50 (us)':>12}{'p99 (us)':>12}{'mean (us)':>12}")
+    for name, timings in results.items():
+        print(f"{name:<28}{np.percentile(timings, 50):>12.1f}{np.percentile(timings, 99):>12.1f}{timings.mean():>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Benchmark: exact GradientBoostingRegressor vs HistGradientBoostingRegressor.
+
+For the original dataset and synthetically scaled-up copies of it, both
+engines are trained with the hyperparameters of the shipped gb_model.pkl
+(histogram boosting gets the equivalent learning rate, iteration count and
+leaf budget) and compared on fit time, single-row and batch predict latency
+through the app's serving path, pickled model size and MAE/RMSE/R².
+
+The shipped model itself is the baseline row, loaded with its own artifacts
+the way the app serves it (legacy schema-1 ones included) and scored on the
+original dataset's held-out rows. It isn't refit, and it was trained on the
+whole dataset, so its errors there are optimistic.
+
+Run from the backend directory:
+
+    python benchmarks/bench_engines.py --data StudentPerformanceFactors.csv --scales 1 10 100 --json engines.json
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from Student_Performance_Boost import TARGET, clean, load_dataset  # noqa: E402
+from artifacts import load_artifacts  # noqa: E402
+from compiled_model import build_predictor  # noqa: E402
+from features import (  # noqa: E402
+    StudentFeatureTransformer, categorical_mappings, feature_order, numerical_features, scaled_features
+)
+
+
+def scale_up(data, factor, seed=0):
+    """Bootstrap ``factor`` x the rows, jittering numerics so rows aren't exact duplicates."""
+    if factor == 1:
+        return data
+    rng = np.random.default_rng(seed)
+    sample = data.iloc[rng.integers(0, len(data), len(data) * factor)].reset_index(drop=True)
+    for column in numerical_features + [TARGET]:
+        values = sample[column].to_numpy(dtype=np.float32)
+        noise = rng.normal(0, 0.02 * float(np.std(values)), len(values)).astype(np.float32)
+        sample[column] = np.clip(values + noise, 0, None)
+    return sample
+
+
+def engines(reference):
+    from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor
+
+    params = reference.get_params()
+    categorical = [feature_order.index(feature) for feature in categorical_mappings]
+    return {
+        'gb (exact)': GradientBoostingRegressor(**params),
+        'hist': HistGradientBoostingRegressor(
+            learning_rate=params['learning_rate'],
+            max_iter=params['n_estimators'],
+            max_leaf_nodes=2 ** params['max_depth'],
+            max_depth=params['max_depth'],
+            min_samples_leaf=max(params['min_samples_leaf'], 1),
+            categorical_features=categorical,
+            early_stopping=False,
+            random_state=params['random_state'],
+        ),
+    }
+
+
+def latency(fn, iterations):
+    for _ in range(min(20, iterations)):
+        fn()
+    timings = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings[i] = time.perf_counter() - start
+    return {'p50_ms': float(np.percentile(timings, 50) * 1e3), 'p99_ms': float(np.percentile(timings, 99) * 1e3)}
+
+
+def model_size(model):
+    buf = io.BytesIO()
+    joblib.dump(model, buf)
+    return buf.tell()
+
+
+def split(data, transformer):
+    from sklearn.model_selection import train_test_split
+
+    raw = transformer.encode(data)
+    y = data[TARGET].to_numpy(dtype=np.float64)
+    return train_test_split(raw, y, test_size=0.2, random_state=42)
+
+
+def measure(engine, scale, rows, fit_seconds, model, predictor, raw_test, y_test, iterations, batch_size):
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+    y_pred = predictor.predict(raw_test)
+    row = raw_test[0]
+    batch = raw_test[:batch_size]
+    return {
+        'engine': engine,
+        'scale': scale,
+        'rows': rows,
+        'fit_seconds': fit_seconds,
+        'single_row': latency(lambda: predictor.predict_one(row), iterations),
+        'batch': {'rows': len(batch), **latency(lambda: predictor.predict(batch), max(iterations // 20, 20))},
+        'model_bytes': model_size(model),
+        'mae': float(mean_absolute_error(y_test, y_pred)),
+        'rmse': float(np.sqrt(mean_squared_error(y_test, y_pred))),
+        'r2': float(r2_score(y_test, y_pred)),
+    }
+
+
+def baseline(data, shipped, iterations, batch_size):
+    # Encoded with the shipped transformer, as the app would; fit time is None since nothing is trained
+    _, raw_test, _, y_test = split(data, shipped.transformer)
+    return measure('gb (shipped)', 1, len(data), None, shipped.model, shipped.predictor, raw_test, y_test,
+                   iterations, batch_size)
+
+
+def run(data, scale, reference, iterations, batch_size):
+    data = scale_up(data, scale)
+    transformer = StudentFeatureTransformer().fit(data)
+    raw_train, raw_test, y_train, y_test = split(data, transformer)
+
+    results = []
+    for name, model in engines(reference).items():
+        start = time.perf_counter()
+        model.fit(transformer.scale(raw_train), y_train)
+        fit_seconds = time.perf_counter() - start
+
+        predictor = build_predictor(model, transformer, feature_order, scaled_features)
+        results.append(measure(name, scale, len(data), fit_seconds, model, predictor, raw_test, y_test,
+                               iterations, batch_size))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', required=True, help="Path to StudentPerformanceFactors.csv")
+    parser.add_argument('--artifacts', default=BACKEND_DIR,
+                        help="Directory of the shipped model: the baseline row, and the hyperparameters both engines use")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--iterations', type=int, default=1000, help="Timed single-row predictions")
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--json', help="Also write the results to this file")
+    args = parser.parse_args()
+
+    shipped = load_artifacts(args.artifacts, use_cache=False, allow_legacy=True)
+    reference = shipped.model
+    print(f"reference {shipped.model_path}: {type(reference).__name__}, "
+          f"schema {shipped.transformer.schema_version_}, {os.path.getsize(shipped.model_path)} bytes on disk")
+    data = clean(load_dataset(args.data))
+
+    results = [baseline(data, shipped, args.iterations, args.batch_size)]
+    for scale in args.scales:
+        results.extend(run(data, scale, reference, args.iterations, args.batch_size))
+
+    header = (f"{'scale':>5} {'rows':>9} {'engine':<12} {'fit s':>8} {'row p50 ms':>11} {'row p99 ms':>11} "
+              f"{'batch p50 ms':>13} {'size KB':>9} {'MAE':>7} {'RMSE':>7} {'R2':>7}")
+    print("\n" + header)
+    print("-" * len(header))
+    for r in results:
+        fit_seconds = '-' if r['fit_seconds'] is None else f"{r['fit_seconds']:.2f}"
+        print(f"{r['scale']:>5} {r['rows']:>9} {r['engine']:<12} {fit_seconds:>8} "
+              f"{r['single_row']['p50_ms']:>11.3f} {r['single_row']['p99_ms']:>11.3f} "
+              f"{r['batch']['p50_ms']:>13.2f} {r['model_bytes'] / 1024:>9.1f} "
+              f"{r['mae']:>7.3f} {r['rmse']:>7.3f} {r['r2']:>7.4f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
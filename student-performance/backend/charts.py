@@ -0,0 +1,95 @@
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+# Output formats served by the chart endpoint
+CHART_FORMATS = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+}
+
+
+class RadarChartRenderer:
+    """Renders the numerical feature profile as a radar chart.
+
+    A single Figure/Axes template is built on first use with the object
+    oriented matplotlib API (no pyplot global state); each render only swaps
+    the data of the existing line and fill artists. Rendering is serialized
+    with a lock because Agg canvases are not safe to draw concurrently, and
+    finished images are kept in a small LRU cache keyed on the plotted values.
+    """
+
+    def __init__(self, labels, cache_size=256, precision=4):
+        self.labels = list(labels)
+        self.cache_size = cache_size
+        self.precision = precision
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._figure = None
+
+    def _build_template(self):
+        # Imported lazily so the prediction path never pays for matplotlib
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        num_vars = len(self.labels)
+        angles = np.linspace(0, 2 * np.pi, num_vars, endpoint=False)
+        self._angles = np.concatenate([angles, angles[:1]])
+
+        figure = Figure(figsize=(6, 6))
+        FigureCanvasAgg(figure)
+        ax = figure.add_subplot(polar=True)
+
+        zeros = np.zeros_like(self._angles)
+        self._line, = ax.plot(self._angles, zeros, color='red', linewidth=2)
+        self._fill, = ax.fill(self._angles, zeros, color='red', alpha=0.25)
+
+        # Add labels
+        ax.set_xticks(angles)
+        ax.set_xticklabels(self.labels, fontsize=9)
+        ax.set_yticklabels([])  # Hide radial labels
+        ax.set_title("Numerical Feature Profile", size=14, y=1.08)
+
+        self._ax = ax
+        self._figure = figure
+
+    def _draw(self, values, fmt):
+        if self._figure is None:
+            self._build_template()
+
+        # Repeat first value to close the plot
+        closed = np.concatenate([values, values[:1]])
+        self._line.set_ydata(closed)
+        self._fill.set_xy(np.column_stack([self._angles, closed]))
+
+        low, high = float(closed.min()), float(closed.max())
+        pad = (high - low) * 0.1 or 1.0
+        self._ax.set_ylim(min(low - pad, 0.0), high + pad)
+
+        buf = io.BytesIO()
+        self._figure.savefig(buf, format=fmt)
+        return buf.getvalue()
+
+    def render(self, values, fmt="png"):
+        if fmt not in CHART_FORMATS:
+            raise ValueError(f"Unsupported chart format '{fmt}'. Must be one of {list(CHART_FORMATS)}")
+
+        values = np.round(np.asarray(values, dtype=np.float64), self.precision)
+        if values.shape != (len(self.labels),):
+            raise ValueError(f"Expected {len(self.labels)} values, got {values.size}")
+
+        key = (fmt, values.tobytes())
+        with self._lock:
+            image = self._cache.get(key)
+            if image is not None:
+                self._cache.move_to_end(key)
+                return image
+
+            image = self._draw(values, fmt)
+            self._cache[key] = image
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return image
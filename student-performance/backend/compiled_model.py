@@ -0,0 +1,295 @@
+import numpy as np
+
+
+# Tree ensembles compare float32 features against float64 thresholds
+TREE_DTYPE = np.float32
+
+
+def _float_to_key(values):
+    # Map float64 values onto int64 keys that sort in the same order as the floats
+    bits = values.view(np.int64)
+    return np.where(bits < 0, -(bits & np.int64(0x7FFFFFFFFFFFFFFF)), bits)
+
+
+def _key_to_float(keys):
+    bits = np.where(keys < 0, (-keys) | np.int64(-0x8000000000000000), keys)
+    return bits.view(np.float64)
+
+
+def fold_thresholds(thresholds, mean, scale):
+    """Return raw-space thresholds equivalent to ``float32((x - mean) / scale) <= threshold``.
+
+    The scaled comparison is monotone in ``x``, so for every split there is a
+    largest float64 ``x`` that still goes left. It is found by bisecting over
+    the ordered bit patterns of float64, which makes ``x <= folded`` agree
+    with the original split for every possible input.
+    """
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    mean = np.asarray(mean, dtype=np.float64)
+    scale = np.asarray(scale, dtype=np.float64)
+
+    def goes_left(keys):
+        x = _key_to_float(keys)
+        with np.errstate(over='ignore', invalid='ignore'):
+            scaled = ((x - mean) / scale).astype(TREE_DTYPE)
+        return scaled <= thresholds
+
+    lo = np.full(thresholds.shape, _float_to_key(np.array([-np.finfo(np.float64).max]))[0])
+    hi = np.full(thresholds.shape, _float_to_key(np.array([np.finfo(np.float64).max]))[0])
+
+    # 64 halvings always close the gap between two int64 keys
+    for _ in range(64):
+        mid = (lo >> 1) + (hi >> 1) + (lo & hi & 1)
+        left = goes_left(mid)
+        lo = np.where(left, mid, lo)
+        hi = np.where(left, hi, mid)
+
+    return _key_to_float(lo)
+
+
+class CompiledGradientBoosting:
+    """Pandas-free scorer for a fitted squared-error ``GradientBoostingRegressor``.
+
+    The StandardScaler is folded into the split thresholds, so ``predict``
+    takes raw (unscaled) feature rows laid out in ``feature_order``. All trees
+    are flattened into contiguous arrays and walked level by level for every
+    tree at once; leaf values are then accumulated stage by stage in the same
+    order as sklearn, so the result is bit-identical to ``model.predict``.
+
+    ``cover`` (training samples reaching each node) is kept for
+    ``contributions``, the exact per-feature TreeSHAP attribution.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, depth, baseline, cover):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        self.baseline = baseline
+        self.cover = cover
+        self._expected_value = None
+
+    @classmethod
+    def from_estimators(cls, model, scaler, feature_order, scaled_features):
+        if model.estimators_.shape[1] != 1:
+            raise ValueError("Only single-output regression ensembles can be compiled")
+        if getattr(model, 'init_', None) in (None, 'zero'):
+            raise ValueError("Model must use the default mean init estimator")
+
+        # Per input column: (x - mean) / scale for scaled features, identity otherwise
+        mean = np.zeros(len(feature_order))
+        scale = np.ones(len(feature_order))
+        for idx, name in enumerate(scaled_features):
+            column = feature_order.index(name)
+            mean[column] = scaler.mean_[idx]
+            scale[column] = scaler.scale_[idx]
+
+        features, thresholds, lefts, rights, values, covers, roots = [], [], [], [], [], [], []
+        depth = 0
+        offset = 0
+        for tree in model.estimators_[:, 0]:
+            t = tree.tree_
+            nodes = np.arange(t.node_count)
+            is_leaf = t.children_left == -1
+
+            # Leaves point at themselves so extra walking steps are no-ops
+            features.append(np.where(is_leaf, 0, t.feature))
+            thresholds.append(t.threshold)
+            lefts.append(np.where(is_leaf, nodes, t.children_left) + offset)
+            rights.append(np.where(is_leaf, nodes, t.children_right) + offset)
+            # sklearn adds learning_rate * value per stage; precomputing the product is exact
+            values.append(model.learning_rate * t.value[:, 0, 0])
+            covers.append(t.weighted_n_node_samples)
+            roots.append(offset)
+            depth = max(depth, t.max_depth)
+            offset += t.node_count
+
+        feature = np.concatenate(features).astype(np.intp)
+        threshold = fold_thresholds(np.concatenate(thresholds), mean[feature], scale[feature])
+
+        return cls(
+            feature=feature,
+            threshold=threshold,
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.intp),
+            depth=depth,
+            baseline=float(np.ravel(model.init_.constant_)[0]),
+            cover=np.concatenate(covers),
+        )
+
+    def save(self, path):
+        # Uncompressed joblib so ``load`` can memory-map every array
+        import joblib
+        joblib.dump({
+            'feature': self.feature, 'threshold': self.threshold, 'left': self.left,
+            'right': self.right, 'value': self.value, 'roots': self.roots,
+            'depth': self.depth, 'baseline': self.baseline, 'cover': self.cover,
+        }, path)
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        """Load arrays written by ``save``; with ``mmap_mode`` they are shared page-cache mappings."""
+        import joblib
+        state = joblib.load(path, mmap_mode=mmap_mode)
+        # Plain ndarray views over the mapping avoid np.memmap subclass overhead per call
+        return cls(**{key: np.asarray(value) if isinstance(value, np.ndarray) else value
+                      for key, value in state.items()})
+
+    def _leaves(self, X):
+        # X has shape (n_rows, n_features); walk every tree for every row at once
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.roots.size))
+        rows = np.arange(X.shape[0])[:, None]
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+        contributions = np.empty((X.shape[0], self.roots.size + 1))
+        contributions[:, 0] = self.baseline
+        contributions[:, 1:] = self.value[self._leaves(X)]
+        # add.accumulate sums left to right, matching sklearn's per-stage +=
+        return np.add.accumulate(contributions, axis=1)[:, -1]
+
+    def predict_one(self, x):
+        x = np.asarray(x, dtype=np.float64)
+        nodes = self.roots
+        for _ in range(self.depth):
+            nodes = np.where(x[self.feature[nodes]] <= self.threshold[nodes], self.left[nodes], self.right[nodes])
+        return float(np.add.accumulate(np.concatenate(([self.baseline], self.value[nodes])))[-1])
+
+    @property
+    def expected_value(self):
+        """Cover-weighted mean prediction over the training data; the base of ``contributions``."""
+        if self._expected_value is None:
+            is_leaf = self.left == np.arange(self.left.size)
+            tree_of_node = np.searchsorted(self.roots, np.arange(self.left.size), side='right') - 1
+            weights = np.where(is_leaf, self.cover / self.cover[self.roots][tree_of_node], 0.0)
+            self._expected_value = self.baseline + float(np.sum(weights * self.value))
+        return self._expected_value
+
+    def contributions(self, x):
+        """Exact TreeSHAP values of one raw row: one per input column, summing to
+        ``predict_one(x) - expected_value``.
+
+        Path-dependent TreeSHAP (Lundberg et al., Algorithm 2), run on every
+        tree and summed; the trees are shallow, so this is a few milliseconds
+        per row instead of re-scoring exponentially many feature subsets.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        phi = np.zeros(x.size)
+        feature, threshold, left, right = self.feature.tolist(), self.threshold.tolist(), self.left.tolist(), self.right.tolist()
+        value, cover = self.value.tolist(), self.cover.tolist()
+        row = x.tolist()
+
+        for root in self.roots.tolist():
+            _tree_shap(root, [], 1.0, 1.0, -1, row, phi, feature, threshold, left, right, value, cover)
+        return phi
+
+
+# TreeSHAP path elements are [feature, zero_fraction, one_fraction, weight]
+
+def _extend_path(path, zero_fraction, one_fraction, feature):
+    depth = len(path)
+    path.append([feature, zero_fraction, one_fraction, 1.0 if depth == 0 else 0.0])
+    for i in range(depth - 1, -1, -1):
+        path[i + 1][3] += one_fraction * path[i][3] * (i + 1) / (depth + 1)
+        path[i][3] = zero_fraction * path[i][3] * (depth - i) / (depth + 1)
+
+
+def _unwind_path(path, index):
+    depth = len(path) - 1
+    _, zero_fraction, one_fraction, _ = path[index]
+    next_one = path[depth][3]
+    for i in range(depth - 1, -1, -1):
+        if one_fraction != 0:
+            weight = path[i][3]
+            path[i][3] = next_one * (depth + 1) / ((i + 1) * one_fraction)
+            next_one = weight - path[i][3] * zero_fraction * (depth - i) / (depth + 1)
+        else:
+            path[i][3] = path[i][3] * (depth + 1) / (zero_fraction * (depth - i))
+    for i in range(index, depth):
+        path[i][:3] = path[i + 1][:3]
+    path.pop()
+
+
+def _unwound_path_sum(path, index):
+    depth = len(path) - 1
+    _, zero_fraction, one_fraction, _ = path[index]
+    next_one = path[depth][3]
+    total = 0.0
+    for i in range(depth - 1, -1, -1):
+        if one_fraction != 0:
+            weight = next_one * (depth + 1) / ((i + 1) * one_fraction)
+            total += weight
+            next_one = path[i][3] - weight * zero_fraction * (depth - i) / (depth + 1)
+        else:
+            total += path[i][3] / zero_fraction / ((depth - i) / (depth + 1))
+    return total
+
+
+def _tree_shap(node, parent_path, zero_fraction, one_fraction, split_feature, x, phi,
+               feature, threshold, left, right, value, cover):
+    path = [element[:] for element in parent_path]
+    _extend_path(path, zero_fraction, one_fraction, split_feature)
+
+    if left[node] == node:
+        for i in range(1, len(path)):
+            weight = _unwound_path_sum(path, i)
+            phi[path[i][0]] += weight * (path[i][2] - path[i][1]) * value[node]
+        return
+
+    f = feature[node]
+    hot, cold = (left[node], right[node]) if x[f] <= threshold[node] else (right[node], left[node])
+
+    # A feature already split on higher up is undone here and redone for this node
+    incoming_zero, incoming_one = 1.0, 1.0
+    for i in range(1, len(path)):
+        if path[i][0] == f:
+            incoming_zero, incoming_one = path[i][1], path[i][2]
+            _unwind_path(path, i)
+            break
+
+    _tree_shap(hot, path, incoming_zero * cover[hot] / cover[node], incoming_one, f, x, phi,
+               feature, threshold, left, right, value, cover)
+    _tree_shap(cold, path, incoming_zero * cover[cold] / cover[node], 0.0, f, x, phi,
+               feature, threshold, left, right, value, cover)
+
+
+class EstimatorPredictor:
+    """Same interface as ``CompiledGradientBoosting`` for models that aren't compiled.
+
+    Scales raw rows with the feature transformer and calls the estimator's own
+    ``predict``; used for ``HistGradientBoostingRegressor``, whose predictor is
+    already native code.
+    """
+
+    def __init__(self, model, transformer):
+        self.model = model
+        self.transformer = transformer
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+        return self.model.predict(self.transformer.scale(X))
+
+    def predict_one(self, x):
+        return float(self.predict(x)[0])
+
+
+def build_predictor(model, transformer, feature_order, scaled_features):
+    """Pick the fastest raw-row predictor available for ``model``."""
+    from sklearn.ensemble import GradientBoostingRegressor
+
+    if isinstance(model, GradientBoostingRegressor):
+        return CompiledGradientBoosting.from_estimators(model, transformer, feature_order, scaled_features)
+    return EstimatorPredictor(model, transformer)
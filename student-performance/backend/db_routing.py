@@ -0,0 +1,79 @@
+from contextlib import contextmanager
+
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Select
+from sqlalchemy.engine import make_url
+
+
+# Bind key of the optional read replica in SQLALCHEMY_BINDS
+REPLICA_BIND = 'replica'
+
+
+def engine_options(database_url, pool_size=10, max_overflow=20, pool_timeout=5, pool_recycle=1800,
+                   pool_pre_ping=True, query_timeout=None):
+    """SQLALCHEMY_ENGINE_OPTIONS for a bounded connection pool with statement timeouts.
+
+    ``pool_timeout`` is how long a request waits for a free connection before
+    failing fast instead of queueing indefinitely; ``pool_recycle`` retires
+    connections before MySQL's wait_timeout drops them and ``pool_pre_ping``
+    replaces any that died anyway. ``query_timeout`` (seconds) caps each
+    statement: MySQL enforces it server-side for SELECTs and client-side on
+    socket reads, SQLite uses it as the lock wait.
+    """
+    url = make_url(database_url)
+    options = {}
+    if not (url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')):
+        # In-memory SQLite uses a single shared connection, so there is nothing to size
+        options.update(pool_size=pool_size, max_overflow=max_overflow, pool_timeout=pool_timeout,
+                       pool_recycle=pool_recycle, pool_pre_ping=pool_pre_ping)
+
+    if query_timeout:
+        if url.get_backend_name() == 'mysql':
+            options['connect_args'] = {
+                'init_command': f"SET SESSION MAX_EXECUTION_TIME={int(query_timeout * 1000)}",
+                'read_timeout': max(int(query_timeout) + 1, 1),
+                'write_timeout': max(int(query_timeout) + 1, 1),
+            }
+        elif url.get_backend_name() == 'sqlite':
+            options['connect_args'] = {'timeout': query_timeout}
+    return options
+
+
+class RoutingSession(Session):
+    """Session that sends reads inside ``read_only`` blocks to the replica bind, if configured.
+
+    Everything else, including flushes and reads outside such blocks (e.g.
+    SELECT ... FOR UPDATE in a write transaction), uses the primary, so only
+    code that opted in can see replication lag.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.info.get('read_only') and not self._flushing:
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None and (clause is None or isinstance(clause, Select)):
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@contextmanager
+def read_only(session):
+    """Route the session's queries in this block to the read replica."""
+    previous = session.info.get('read_only', False)
+    session.info['read_only'] = True
+    try:
+        yield
+    finally:
+        session.info['read_only'] = previous
+
+
+def pool_stats(engine):
+    """Checked-out / idle / overflow connections of a QueuePool (empty for other pools)."""
+    pool = engine.pool
+    if not hasattr(pool, 'checkedout'):
+        return {}
+    return {
+        'size': pool.size(),
+        'checked_out': pool.checkedout(),
+        'idle': pool.checkedin(),
+        'overflow': max(pool.overflow(), 0),
+    }
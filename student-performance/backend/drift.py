@@ -0,0 +1,214 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from background import ProcessLocalThread
+from features import FEATURE_SCHEMA_VERSION, categorical_mappings, feature_index, scaled_features
+
+
+# Written next to the model artifacts by the training script
+BASELINE_FILE = "drift_baseline.json"
+
+# Quantile bins per numerical feature; discrete features end up with fewer
+BASELINE_BINS = 10
+
+# Usual PSI reading: below 0.1 stable, up to 0.25 moderate shift, above that significant
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+
+# Floor for empty bins so PSI stays finite
+PSI_EPSILON = 1e-4
+
+
+def _bin_counts(values, edges):
+    return np.bincount(np.searchsorted(edges, values, side='right'), minlength=len(edges) + 1)
+
+
+def _distribution(values, bins):
+    # Mean/std plus inner quantile edges and the share of values in each bin
+    edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1]))
+    return {
+        "mean": float(np.mean(values)),
+        "std": float(np.std(values)),
+        "edges": edges.tolist(),
+        "proportions": (_bin_counts(values, edges) / len(values)).tolist(),
+    }
+
+
+def build_baseline(transformer, raw, predictions, bins=BASELINE_BINS):
+    """Training-data reference for drift checks, from the raw (unscaled) model matrix and its predictions."""
+    categorical = {}
+    for feature in categorical_mappings:
+        counts = np.bincount(raw[:, feature_index[feature]].astype(np.int64), minlength=len(transformer.categories_[feature]))
+        categorical[feature] = {
+            "categories": list(transformer.categories_[feature]),
+            "proportions": (counts / len(raw)).tolist(),
+        }
+    return {
+        "schema_version": FEATURE_SCHEMA_VERSION,
+        "count": int(len(raw)),
+        "numerical": {feature: _distribution(raw[:, feature_index[feature]], bins) for feature in scaled_features},
+        "categorical": categorical,
+        "prediction": _distribution(np.asarray(predictions, dtype=np.float64), bins),
+    }
+
+
+def load_baseline(directory):
+    path = os.path.join(directory, BASELINE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        baseline = json.load(f)
+    if baseline.get("schema_version") != FEATURE_SCHEMA_VERSION:
+        raise ValueError(f"Drift baseline has feature schema {baseline.get('schema_version')}, expected {FEATURE_SCHEMA_VERSION}")
+    return baseline
+
+
+def psi(expected, actual):
+    """Population stability index between two binned distributions (proportions)."""
+    expected = np.maximum(np.asarray(expected, dtype=np.float64), PSI_EPSILON)
+    actual = np.maximum(np.asarray(actual, dtype=np.float64), PSI_EPSILON)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def binned_ks(expected, actual):
+    """Kolmogorov-Smirnov distance evaluated at the bin edges (a lower bound of the exact one)."""
+    return float(np.max(np.abs(np.cumsum(actual) - np.cumsum(expected))))
+
+
+def drift_status(score):
+    if score >= PSI_SIGNIFICANT:
+        return "significant"
+    return "moderate" if score >= PSI_MODERATE else "stable"
+
+
+class DriftMonitor:
+    """Live feature and prediction statistics compared against the training baseline.
+
+    ``record`` is all the request path pays: one append to a bounded deque.
+    A background thread folds the pending rows into the statistics every
+    ``interval`` seconds, a batch at a time: count/mean/M2 per numerical and
+    derived feature and for the predictions (Welford, merged per batch with
+    Chan's formula), counts in the baseline's bins, and counts per category.
+    Memory is constant per feature however long it runs. If more than
+    ``max_pending`` rows queue up between flushes the oldest are dropped,
+    which only thins the sample.
+
+    ``report`` computes PSI and binned KS scores on demand. Statistics are
+    per process and cover everything since the start or the last ``reset``.
+    """
+
+    def __init__(self, baseline, max_pending=65536, interval=1.0):
+        self.baseline = baseline
+        self.interval = interval
+        self._pending = deque(maxlen=max_pending)
+        self._lock = threading.Lock()
+        self._worker = ProcessLocalThread(self._run, "drift-monitor")
+
+        # Numerical + derived columns, then the prediction as the last one
+        self._names = list(baseline["numerical"]) + ["prediction"]
+        self._columns = [feature_index[feature] for feature in baseline["numerical"]]
+        self._edges = [np.asarray(baseline["numerical"][feature]["edges"]) for feature in baseline["numerical"]]
+        self._edges.append(np.asarray(baseline["prediction"]["edges"]))
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._pending.clear()
+            self.count = 0
+            self._mean = np.zeros(len(self._names))
+            self._m2 = np.zeros(len(self._names))
+            self._bins = [np.zeros(len(edges) + 1, dtype=np.int64) for edges in self._edges]
+            self._categories = {
+                feature: np.zeros(len(reference["categories"]), dtype=np.int64)
+                for feature, reference in self.baseline["categorical"].items()
+            }
+            self.started_at = time.time()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+    def record(self, raw_features, prediction):
+        """Queue one scored row (raw feature vector in model order) for the statistics."""
+        self._worker.ensure_started()
+        self._pending.append((raw_features, prediction))
+
+    def flush(self):
+        with self._lock:
+            rows = []
+            while self._pending:
+                try:
+                    rows.append(self._pending.popleft())
+                except IndexError:
+                    break
+            if not rows:
+                return
+
+            raw = np.stack([features for features, _ in rows])
+            values = np.column_stack([raw[:, self._columns], [prediction for _, prediction in rows]])
+
+            # Chan et al.: merge the batch's moments into the running ones
+            n_batch = len(values)
+            batch_mean = values.mean(axis=0)
+            batch_m2 = ((values - batch_mean) ** 2).sum(axis=0)
+            total = self.count + n_batch
+            delta = batch_mean - self._mean
+            self._mean = self._mean + delta * n_batch / total
+            self._m2 = self._m2 + batch_m2 + delta ** 2 * self.count * n_batch / total
+            self.count = total
+
+            for column, (edges, counts) in enumerate(zip(self._edges, self._bins)):
+                counts += _bin_counts(values[:, column], edges)
+            for feature, counts in self._categories.items():
+                counts += np.bincount(raw[:, feature_index[feature]].astype(np.int64), minlength=len(counts))
+
+    def _numeric_report(self, column, reference):
+        proportions = self._bins[column] / self.count
+        std = float(np.sqrt(self._m2[column] / self.count))
+        score = psi(reference["proportions"], proportions)
+        return {
+            "psi": score,
+            "ks": binned_ks(reference["proportions"], proportions),
+            "status": drift_status(score),
+            "mean": float(self._mean[column]),
+            "std": std,
+            "baseline_mean": reference["mean"],
+            "baseline_std": reference["std"],
+            # Shift of the live mean in baseline standard deviations
+            "mean_shift": (float(self._mean[column]) - reference["mean"]) / reference["std"] if reference["std"] else 0.0,
+        }
+
+    def report(self):
+        """Drift scores per feature and for the predictions; None scores until rows have been seen."""
+        self.flush()
+        with self._lock:
+            summary = {
+                "since": self.started_at,
+                "count": self.count,
+                "baseline_count": self.baseline["count"],
+                "features": {},
+                "prediction": None,
+            }
+            if not self.count:
+                return summary
+
+            for column, feature in enumerate(self._names[:-1]):
+                summary["features"][feature] = self._numeric_report(column, self.baseline["numerical"][feature])
+            for feature, counts in self._categories.items():
+                reference = self.baseline["categorical"][feature]
+                proportions = counts / self.count
+                score = psi(reference["proportions"], proportions)
+                summary["features"][feature] = {
+                    "psi": score,
+                    "status": drift_status(score),
+                    "frequencies": dict(zip(reference["categories"], proportions.tolist())),
+                    "baseline_frequencies": dict(zip(reference["categories"], reference["proportions"])),
+                }
+            summary["prediction"] = self._numeric_report(len(self._names) - 1, self.baseline["prediction"])
+            return summary
@@ -0,0 +1,224 @@
+import math
+
+import numpy as np
+
+
+# Bumped whenever encoding or derived-feature definitions change; a model is
+# only valid together with a transformer of the same schema version
+FEATURE_SCHEMA_VERSION = 2
+
+# Allowed values for each categorical feature (display order)
+categorical_mappings = {
+    "Parental_Involvement": ["Low", "Medium", "High"],
+    "Access_to_Resources": ["Low", "Medium", "High"],
+    "Motivation_Level": ["Low", "Medium", "High"],
+    "Family_Income": ["Low", "Medium", "High"],
+    "Teacher_Quality": ["Low", "Medium", "High"],
+    "Peer_Influence": ["Negative", "Neutral", "Positive"],
+    "Parental_Education_Level": ["High School", "College", "Post Graduate"],
+    "Distance_from_Home": ["Near", "Moderate", "Far"]
+}
+
+# Spellings found in the training CSV that differ from the API values
+category_aliases = {
+    "Parental_Education_Level": {"Postgraduate": "Post Graduate"}
+}
+
+numerical_features = [
+    "Hours_Studied", "Attendance", "Sleep_Hours", "Previous_Scores",
+    "Tutoring_Sessions", "Physical_Activity"
+]
+
+derived_features = ["Study_Efficiency", "Improvement_Rate", "Tutoring_Effect"]
+
+# Numerical + derived features, in the column order the scaling is fitted on
+scaled_features = numerical_features + derived_features
+
+# Model input column order
+feature_order = [
+    "Hours_Studied", "Attendance", "Parental_Involvement", "Access_to_Resources",
+    "Sleep_Hours", "Previous_Scores", "Motivation_Level", "Tutoring_Sessions",
+    "Family_Income", "Teacher_Quality", "Peer_Influence", "Physical_Activity",
+    "Parental_Education_Level", "Distance_from_Home", "Study_Efficiency",
+    "Improvement_Rate", "Tutoring_Effect"
+]
+
+feature_index = {feature: idx for idx, feature in enumerate(feature_order)}
+scaled_index = [feature_index[feature] for feature in scaled_features]
+
+
+class StudentFeatureTransformer:
+    """Encoding, derived features and scaling shared by training and serving.
+
+    ``encode`` turns raw columns into the unscaled model matrix (categorical
+    codes, raw numericals, derived features) and ``scale`` standardizes the
+    numerical + derived columns. Both work on whole arrays; single requests go
+    through ``validate_row`` and ``encode_rows``, which feed the same column
+    code, so a row is transformed identically alone or inside a batch.
+
+    Categories are coded in sorted order, matching the ``LabelEncoder`` the
+    original model was trained with. The class follows the sklearn
+    fit/transform API without importing sklearn, so serving can load it
+    without paying for that import.
+    """
+
+    def __init__(self, categories=None):
+        self.categories = categories
+
+    def _set_categories(self):
+        categories = self.categories or categorical_mappings
+        self.categories_ = {feature: sorted(categories[feature]) for feature in categorical_mappings}
+        self._codes = {
+            feature: {value: code for code, value in enumerate(values)}
+            for feature, values in self.categories_.items()
+        }
+
+    @classmethod
+    def from_scaler(cls, scaler, categories=None):
+        """Build a fitted transformer from a legacy ``StandardScaler`` artifact.
+
+        Legacy artifacts predate the schema versioning, so the result is
+        stamped schema 1 and ``check_model`` rejects it until retrained.
+        """
+        if list(scaler.feature_names_in_) != scaled_features:
+            raise ValueError(f"Scaler was fitted on {list(scaler.feature_names_in_)}, expected {scaled_features}")
+        transformer = cls(categories)
+        transformer._set_categories()
+        transformer.mean_ = np.asarray(scaler.mean_, dtype=np.float64)
+        transformer.scale_ = np.asarray(scaler.scale_, dtype=np.float64)
+        transformer.schema_version_ = 1
+        return transformer
+
+    def fit(self, X, y=None):
+        self._set_categories()
+        raw = self.encode(X)[:, scaled_index]
+        self.mean_ = raw.mean(axis=0)
+        scale = raw.std(axis=0)
+        # Same rule as StandardScaler: constant columns are left unscaled
+        scale[scale < 10 * np.finfo(scale.dtype).eps] = 1.0
+        self.scale_ = scale
+        self.schema_version_ = FEATURE_SCHEMA_VERSION
+        return self
+
+    def encode_categorical(self, feature, values):
+        """Vectorized codes for one categorical column; raises ValueError on unknown values."""
+        if hasattr(values, 'cat'):
+            # pandas category column: encode the few categories once, then gather by code
+            lookup = self.encode_categorical(feature, np.asarray(values.cat.categories, dtype=object))
+            codes = values.cat.codes.to_numpy()
+            if (codes < 0).any():
+                raise ValueError(f"Missing value for {feature}. Must be one of {categorical_mappings[feature]}")
+            return lookup[codes]
+
+        values = np.asarray(values, dtype=object)
+        for alias, canonical in category_aliases.get(feature, {}).items():
+            values = np.where(values == alias, canonical, values)
+
+        categories = np.asarray(self.categories_[feature], dtype=object)
+        codes = np.searchsorted(categories, values.astype(str))
+        codes = np.minimum(codes, len(categories) - 1)
+        invalid = categories[codes] != values
+        if invalid.any():
+            bad = values[invalid][0]
+            raise ValueError(f"Invalid value '{bad}' for {feature}. Must be one of {categorical_mappings[feature]}")
+        return codes
+
+    def _assemble(self, columns):
+        # columns: feature name -> 1-D float array for every numerical and categorical feature
+        n_rows = len(columns[numerical_features[0]])
+        matrix = np.empty((n_rows, len(feature_order)), dtype=np.float64)
+        for feature, values in columns.items():
+            matrix[:, feature_index[feature]] = values
+
+        # Derived features, computed column-wise for the whole batch
+        hours = matrix[:, feature_index["Hours_Studied"]]
+        matrix[:, feature_index["Study_Efficiency"]] = hours / (matrix[:, feature_index["Attendance"]] + 1)
+        matrix[:, feature_index["Improvement_Rate"]] = matrix[:, feature_index["Previous_Scores"]] / (hours + 1)
+        matrix[:, feature_index["Tutoring_Effect"]] = matrix[:, feature_index["Tutoring_Sessions"]] / (hours + 1)
+        return matrix
+
+    def encode(self, X):
+        """Raw (unscaled) model matrix from a DataFrame or a mapping of columns."""
+        columns = {feature: np.asarray(X[feature], dtype=np.float64) for feature in numerical_features}
+        for feature in categorical_mappings:
+            columns[feature] = self.encode_categorical(feature, X[feature])
+        return self._assemble(columns)
+
+    def encode_rows(self, rows):
+        """Raw model matrix from rows already checked by ``validate_row``."""
+        columns = {
+            feature: np.fromiter((row[feature] for row in rows), dtype=np.float64, count=len(rows))
+            for feature in numerical_features + list(categorical_mappings)
+        }
+        return self._assemble(columns)
+
+    def encode_columns(self, columns):
+        """Raw model matrix from numerical columns and categorical columns that are already codes."""
+        return self._assemble({
+            feature: np.asarray(columns[feature], dtype=np.float64)
+            for feature in numerical_features + list(categorical_mappings)
+        })
+
+    def scale(self, raw):
+        scaled = np.array(raw, dtype=np.float64)
+        scaled[..., scaled_index] = (scaled[..., scaled_index] - self.mean_) / self.scale_
+        return scaled
+
+    def transform(self, X):
+        return self.scale(self.encode(X))
+
+    def fit_transform(self, X, y=None):
+        return self.fit(X, y).transform(X)
+
+    def get_feature_names_out(self, input_features=None):
+        return np.asarray(feature_order, dtype=object)
+
+    def validate_row(self, row):
+        """Validate one raw student record and return (encoded_values, error).
+
+        ``encoded_values`` holds the numerical features as floats and the
+        categorical features as integer codes, keyed by feature name.
+        Numerical features must be non-negative: the derived ratios divide by
+        ``Attendance + 1`` and ``Hours_Studied + 1``, so a negative value can
+        make them infinite or NaN.
+        """
+        if not isinstance(row, dict):
+            return None, "Each student must be a JSON object"
+
+        missing_features = [feature for feature in numerical_features + list(categorical_mappings.keys()) if feature not in row]
+        if missing_features:
+            return None, f"Missing features: {missing_features}"
+
+        encoded = {}
+        for feature in numerical_features:
+            try:
+                value = float(row[feature])
+            except (TypeError, ValueError):
+                return None, f"Invalid numeric value '{row[feature]}' for {feature}"
+            if not math.isfinite(value):
+                return None, f"Invalid numeric value '{row[feature]}' for {feature}"
+            if value < 0:
+                return None, f"Invalid value '{row[feature]}' for {feature}. Must be non-negative"
+            encoded[feature] = value
+
+        for feature, codes in self._codes.items():
+            value = row[feature]
+            value = category_aliases.get(feature, {}).get(value, value)
+            code = codes.get(value) if isinstance(value, str) else None
+            if code is None:
+                return None, f"Invalid value '{row[feature]}' for {feature}. Must be one of {categorical_mappings[feature]}"
+            encoded[feature] = code
+
+        return encoded, None
+
+    def check_schema(self):
+        if getattr(self, 'schema_version_', None) != FEATURE_SCHEMA_VERSION:
+            raise ValueError(f"Transformer has feature schema {getattr(self, 'schema_version_', None)}, expected {FEATURE_SCHEMA_VERSION}")
+
+    def check_model(self, model, schema=True):
+        """Raise if this transformer or ``model`` doesn't match the current feature layout."""
+        if schema:
+            self.check_schema()
+        model_features = list(getattr(model, 'feature_names_in_', feature_order))
+        if model_features != feature_order:
+            raise ValueError(f"Model expects features {model_features}, transformer produces {feature_order}")
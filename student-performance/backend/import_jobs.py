@@ -0,0 +1,102 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ImportJob:
+    """Progress of one bulk import; updated by the workers, read by the status endpoint."""
+
+    def __init__(self, total, chunk_size):
+        self.id = uuid.uuid4().hex
+        self.total = total
+        self.chunk_size = chunk_size
+        self.chunks = (total + chunk_size - 1) // chunk_size
+        self.created_at = time.time()
+        self.finished_at = None
+
+        self._lock = threading.Lock()
+        self.chunks_done = 0
+        self.processed = 0
+        self.inserted = 0
+        self.errors = []
+
+    @property
+    def status(self):
+        if self.finished_at is not None:
+            return "completed" if not self.errors else "completed_with_errors"
+        return "running" if self.processed else "queued"
+
+    def record_chunk(self, processed, inserted, errors):
+        with self._lock:
+            self.chunks_done += 1
+            self.processed += processed
+            self.inserted += inserted
+            self.errors.extend(errors)
+            if self.chunks_done == self.chunks:
+                self.finished_at = time.time()
+
+    def to_dict(self):
+        with self._lock:
+            elapsed = (self.finished_at or time.time()) - self.created_at
+            return {
+                "job_id": self.id,
+                "status": self.status,
+                "total": self.total,
+                "processed": self.processed,
+                "inserted": self.inserted,
+                "failed": len(self.errors),
+                "progress": self.processed / self.total if self.total else 1.0,
+                "elapsed_seconds": round(elapsed, 3),
+                "errors": sorted(self.errors, key=lambda error: error["index"])
+            }
+
+
+class ImportJobManager:
+    """Runs bulk imports in chunks on a worker pool and keeps the recent jobs.
+
+    ``process_chunk(rows, start)`` does the work for one chunk and returns
+    ``(inserted, errors)``, where each error is ``{"index": ..., "error": ...}``
+    with the row's index in the whole upload. Jobs live in this process only
+    and the oldest finished ones are dropped past ``max_jobs``.
+    """
+
+    def __init__(self, process_chunk, workers=2, chunk_size=500, max_jobs=100):
+        self.process_chunk = process_chunk
+        self.chunk_size = chunk_size
+        self.max_jobs = max_jobs
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="student-import")
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+
+    def submit(self, rows):
+        job = ImportJob(len(rows), self.chunk_size)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+
+        if not rows:
+            job.finished_at = time.time()
+        for start in range(0, len(rows), self.chunk_size):
+            self._pool.submit(self._run_chunk, job, rows[start:start + self.chunk_size], start)
+        return job
+
+    def _run_chunk(self, job, rows, start):
+        try:
+            inserted, errors = self.process_chunk(rows, start)
+        except Exception as e:
+            # The chunk's transaction was rolled back, so none of its rows were stored
+            inserted, errors = 0, [{"index": start + i, "error": f"Chunk failed: {e}"} for i in range(len(rows))]
+        job.record_chunk(len(rows), inserted, errors)
+
+    def _prune(self):
+        while len(self._jobs) > self.max_jobs:
+            oldest = next((job_id for job_id, job in self._jobs.items() if job.finished_at is not None), None)
+            if oldest is None:
+                break
+            del self._jobs[oldest]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
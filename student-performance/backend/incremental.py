@@ -0,0 +1,243 @@
+import json
+import os
+import time
+
+import numpy as np
+from sqlalchemy import select
+
+from features import feature_order
+from rescoring import encode_stored, feature_columns, stream_chunks, student_table
+
+
+# Last student id folded into the model, plus a report per update; kept with the artifacts
+STATE_FILE = "incremental_state.json"
+
+# Share of the new rows (the most recent ones) held out to check an update before it is written
+HOLDOUT_FRACTION = 0.2
+
+
+def default_out_dir(artifact_dir):
+    # Next to the live artifacts rather than over them; activate it with /models/load once checked
+    return os.path.normpath(artifact_dir) + "-incremental"
+
+
+def load_state(directory):
+    path = os.path.join(directory, STATE_FILE)
+    if not os.path.exists(path):
+        return {"last_student_id": 0, "updates": []}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _artifact_id(directory):
+    from artifacts import fingerprint
+
+    directory = os.path.abspath(directory)
+    return {"directory": directory, "fingerprint": fingerprint(
+        [os.path.join(directory, "gb_model.pkl"), os.path.join(directory, "feature_transformer.pkl")])}
+
+
+def resume_dir(artifact_dir, out_dir):
+    """Where an update continues from: ``out_dir`` if it already holds updates of ``artifact_dir``.
+
+    The checkpoint lives in the state file next to the model it describes,
+    so repeated updates into a separate ``out_dir`` keep extending that
+    model with only the rows added since, until ``artifact_dir`` itself
+    changes (e.g. a retrain), which starts a new line of updates.
+    """
+    state = load_state(out_dir)
+    if os.path.abspath(out_dir) != os.path.abspath(artifact_dir) and state.get("base") == _artifact_id(artifact_dir):
+        return out_dir
+    return artifact_dir
+
+
+def labelled_rows_since(engine, last_id, max_rows=None, chunk_size=5000):
+    """Students with ``id > last_id`` whose actual exam score is known, in id order.
+
+    The id checkpoint assumes labels are insert-only: exam_score is set when
+    the student is added or imported, never filled in on an existing row. A
+    score written later onto a student below the checkpoint is not picked up.
+    """
+    students = student_table()
+    query = (select(students.c.id, students.c.exam_score, *[students.c[name] for name in feature_columns.values()])
+             .where(students.c.id > last_id, students.c.exam_score.isnot(None))
+             .order_by(students.c.id))
+    rows = []
+    for partition in stream_chunks(engine, query, chunk_size):
+        rows.extend(partition)
+        if max_rows and len(rows) >= max_rows:
+            return rows[:max_rows]
+    return rows
+
+
+def model_input(model, transformer, raw):
+    scaled = transformer.scale(raw)
+    if hasattr(model, 'feature_names_in_'):
+        # The exact engine was fitted on a DataFrame; keep its column names
+        import pandas as pd
+        return pd.DataFrame(scaled, columns=feature_order)
+    return scaled
+
+
+def add_stages(model, X, y, n_new):
+    """Fit ``n_new`` more boosting stages on (X, y) on top of the existing ones (``warm_start``).
+
+    The new trees fit the current ensemble's residuals on the new rows, so
+    the trees already trained and the transformer's scaling stay untouched;
+    early stopping is switched off since the stage count is given.
+    """
+    if hasattr(model, 'n_estimators_'):
+        model.set_params(warm_start=True, n_estimators=model.n_estimators_ + n_new, n_iter_no_change=None)
+    else:
+        model.set_params(warm_start=True, max_iter=model.n_iter_ + n_new, early_stopping=False)
+    model.fit(X, y)
+    model.set_params(warm_start=False)
+    return model
+
+
+def mean_absolute_error(model, X, y):
+    return float(np.mean(np.abs(model.predict(X) - y)))
+
+
+def full_refit_seconds(model, transformer, data_path, X_new, y_new, n_estimators):
+    """Time a from-scratch fit with the same hyperparameters on the training CSV plus the new rows."""
+    import pandas as pd
+    from sklearn.base import clone
+
+    from Student_Performance_Boost import TARGET, clean, load_dataset
+
+    data = clean(load_dataset(data_path))
+    X = model_input(model, transformer, transformer.encode(data))
+    y = data[TARGET].to_numpy(dtype=np.float64)
+    if isinstance(X, pd.DataFrame):
+        X = pd.concat([X, X_new], ignore_index=True)
+    else:
+        X = np.vstack([X, X_new])
+    y = np.concatenate([y, y_new])
+
+    if hasattr(model, 'n_estimators_'):
+        fresh = clone(model).set_params(warm_start=False, n_estimators=n_estimators, n_iter_no_change=None)
+    else:
+        fresh = clone(model).set_params(warm_start=False, max_iter=n_estimators, early_stopping=False)
+    start = time.perf_counter()
+    fresh.fit(X, y)
+    return time.perf_counter() - start
+
+
+def update_model(engine, artifact_dir, out_dir=None, n_new_stages=20, min_rows=50, max_rows=None,
+                 holdout=HOLDOUT_FRACTION, compare_data=None, log=print):
+    """Extend the model in ``artifact_dir`` with students labelled since the last update.
+
+    Only rows past the checkpoint (the last student id used) are read. The
+    most recent ``holdout`` share of them is kept out of the fit; the new
+    stages are only accepted if they don't raise the error on those rows.
+    Accepted artifacts are written to ``out_dir`` (default: a sibling
+    ``<artifact_dir>-incremental``; pass ``artifact_dir`` itself to update
+    in place, which running servers hot-reload) with the checkpoint
+    advanced to the last fitted row, so held-out rows are fitted next time.
+    Later updates into the same ``out_dir`` continue from that model and
+    checkpoint (see ``resume_dir``).
+
+    The returned report compares the update's total cost with a full
+    retrain: the original training run's recorded search + fit time from
+    metrics.json and, with ``compare_data`` (the training CSV), a measured
+    refit with the same hyperparameters. Returns None when fewer than
+    ``min_rows`` new labelled rows exist.
+    """
+    import joblib
+
+    from drift import load_baseline
+    from Student_Performance_Boost import atomic_write, json_writer, save_artifacts
+    from tuning import n_boosting_stages
+
+    out_dir = out_dir or default_out_dir(artifact_dir)
+    source_dir = resume_dir(artifact_dir, out_dir)
+    state = load_state(source_dir)
+    if source_dir == artifact_dir:
+        state["base"] = _artifact_id(artifact_dir)
+    start = time.perf_counter()
+
+    query_start = time.perf_counter()
+    rows = labelled_rows_since(engine, state["last_student_id"], max_rows)
+    query_seconds = time.perf_counter() - query_start
+    if len(rows) < min_rows:
+        log(f"{len(rows)} new labelled students since id {state['last_student_id']}; "
+            f"need at least {min_rows}, nothing to do")
+        return None
+
+    load_start = time.perf_counter()
+    # A writable copy: warm_start grows the estimator arrays in place
+    model = joblib.load(os.path.join(source_dir, "gb_model.pkl"))
+    transformer = joblib.load(os.path.join(source_dir, "feature_transformer.pkl"))
+    transformer.check_model(model)
+    load_seconds = time.perf_counter() - load_start
+
+    # Rows are in id order, so the held-out tail is the most recently added students
+    n_holdout = min(max(int(len(rows) * holdout), 1), len(rows) - 1) if holdout else 0
+    fit_rows, holdout_rows = rows[:len(rows) - n_holdout], rows[len(rows) - n_holdout:]
+    X = model_input(model, transformer, encode_stored(transformer, fit_rows))
+    y = np.array([row["exam_score"] for row in fit_rows], dtype=np.float64)
+    if holdout_rows:
+        X_holdout = model_input(model, transformer, encode_stored(transformer, holdout_rows))
+        y_holdout = np.array([row["exam_score"] for row in holdout_rows], dtype=np.float64)
+        mae_holdout_before = mean_absolute_error(model, X_holdout, y_holdout)
+    stages_before = n_boosting_stages(model)
+    mae_before = mean_absolute_error(model, X, y)
+
+    fit_start = time.perf_counter()
+    add_stages(model, X, y, n_new_stages)
+    fit_seconds = time.perf_counter() - fit_start
+
+    metrics_path = os.path.join(source_dir, "metrics.json")
+    metrics = {}
+    if os.path.exists(metrics_path):
+        with open(metrics_path) as f:
+            metrics = json.load(f)
+
+    report = {
+        "rows": len(fit_rows),
+        "holdout_rows": len(holdout_rows),
+        "first_student_id": fit_rows[0]["id"],
+        "last_student_id": fit_rows[-1]["id"],
+        "stages_before": stages_before,
+        "stages_after": n_boosting_stages(model),
+        "mae_new_rows_before": mae_before,
+        # In-sample: the new stages were fitted on these rows
+        "mae_new_rows_after": mean_absolute_error(model, X, y),
+        "query_seconds": query_seconds,
+        "load_seconds": load_seconds,
+        "fit_seconds": fit_seconds,
+        "accepted": True,
+    }
+    if holdout_rows:
+        report["mae_holdout_before"] = mae_holdout_before
+        report["mae_holdout_after"] = mean_absolute_error(model, X_holdout, y_holdout)
+        if report["mae_holdout_after"] > mae_holdout_before:
+            report["accepted"] = False
+            log(f"Held-out MAE got worse ({mae_holdout_before:.4f} -> {report['mae_holdout_after']:.4f}); "
+                f"nothing written")
+            return report
+
+    save_start = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    metrics.update(n_estimators=report["stages_after"], incremental=report)
+    # The training-data baseline stays the drift reference for the updated model
+    save_artifacts(out_dir, model, transformer, metrics, load_baseline(source_dir))
+    report["save_seconds"] = time.perf_counter() - save_start
+    report["total_seconds"] = time.perf_counter() - start
+
+    # Both speedups are against the update's total cost (query + load + fit + save)
+    # What a full retrain cost when these artifacts were produced
+    if "search_seconds" in metrics:
+        full_seconds = metrics["search_seconds"] + metrics.get("baseline", {}).get("fit_seconds", 0.0)
+        report["full_retrain_seconds_recorded"] = full_seconds
+        report["speedup_vs_recorded_retrain"] = full_seconds / report["total_seconds"]
+    if compare_data:
+        refit = full_refit_seconds(model, transformer, compare_data, X, y, report["stages_after"])
+        report["full_refit_seconds_measured"] = refit
+        report["speedup_vs_measured_refit"] = refit / report["total_seconds"]
+
+    state["last_student_id"] = report["last_student_id"]
+    state["updates"].append({"finished_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"), **report})
+    atomic_write(os.path.join(out_dir, STATE_FILE), json_writer(state))
+    return report
@@ -0,0 +1,75 @@
+import queue
+import time
+from concurrent.futures import Future
+
+from background import ProcessLocalThread
+
+
+class MicroBatcher:
+    """Coalesces items submitted by concurrent requests into batches for one worker thread.
+
+    The worker takes the first waiting item, then keeps collecting until
+    ``max_batch`` items are queued or ``max_wait`` seconds have passed since
+    that first item arrived, and hands the batch to ``process_batch(items)``.
+    It returns one result per item; a result that is an exception is raised
+    to that item's caller only, while an exception from ``process_batch``
+    itself (or from ``on_batch``) fails the whole batch, never the worker.
+    With ``max_wait=0`` nothing is delayed: a batch is whatever queued up
+    while the previous one was processed. A caller that stops waiting can
+    cancel its future; the item is skipped unless its batch already started.
+
+    ``on_batch(size, oldest_wait_seconds)`` is called for every batch, e.g.
+    to feed metrics.
+    """
+
+    def __init__(self, process_batch, max_batch=256, max_wait=0.002, name="micro-batcher", on_batch=None):
+        self.process_batch = process_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.name = name
+        self.on_batch = on_batch
+        self._queue = queue.SimpleQueue()
+        # A forked worker gets a fresh queue: items queued in the parent have no worker there
+        self._worker = ProcessLocalThread(self._run, name, on_start=self._reset_queue)
+
+    def _reset_queue(self):
+        self._queue = queue.SimpleQueue()
+
+    def submit(self, item):
+        """Queue ``item``; returns a Future for its result."""
+        self._worker.ensure_started()
+        future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = first[2] + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            # Items whose caller gave up (cancelled their future) are dropped unprocessed
+            batch = [entry for entry in self._collect(self._queue.get()) if entry[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            try:
+                if self.on_batch is not None:
+                    self.on_batch(len(batch), time.perf_counter() - batch[0][2])
+                results = self.process_batch([item for item, _, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"{self.name}: {len(results)} results for a batch of {len(batch)}")
+            except BaseException as e:
+                results = [e] * len(batch)
+            for (_, future, _), result in zip(batch, results):
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
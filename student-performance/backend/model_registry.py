@@ -0,0 +1,270 @@
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from artifacts import StartupTimer, artifact_set_complete, fingerprint, load_artifacts, warm_up
+from background import ProcessLocalThread
+
+
+class LatencyStats:
+    """Request count and a sliding window of latencies for percentile reporting."""
+
+    def __init__(self, window=2048):
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+            self.total += seconds
+
+    def summary(self):
+        with self._lock:
+            samples = np.array(self._samples)
+            count, total = self.count, self.total
+        if not count:
+            return {"count": 0}
+        return {
+            "count": count,
+            "mean_ms": total / count * 1e3,
+            "p50_ms": float(np.percentile(samples, 50) * 1e3),
+            "p99_ms": float(np.percentile(samples, 99) * 1e3)
+        }
+
+
+class ModelVersion:
+    """An immutable, warmed-up artifact set plus its serving statistics."""
+
+    def __init__(self, name, artifacts, startup):
+        self.name = name
+        self.artifacts = artifacts
+        self.transformer = artifacts.transformer
+        self.predictor = artifacts.predictor
+        self.directory = artifacts.directory
+        self.fingerprint = artifacts.fingerprint
+        self.loaded_at = time.time()
+        self.startup = startup
+        self.latency = LatencyStats()
+        # Shadow scoring against the active version
+        self.shadow_latency = LatencyStats()
+        self.shadow_abs_diff = 0.0
+        self._shadow_lock = threading.Lock()
+
+    def record_shadow(self, seconds, abs_diff):
+        self.shadow_latency.record(seconds)
+        with self._shadow_lock:
+            self.shadow_abs_diff += abs_diff
+
+    def describe(self):
+        shadow = self.shadow_latency.summary()
+        if shadow["count"]:
+            shadow["mean_abs_diff"] = self.shadow_abs_diff / shadow["count"]
+        return {
+            "name": self.name,
+            "directory": self.directory,
+            "fingerprint": self.fingerprint,
+            "schema_version": self.transformer.schema_version_,
+            "loaded_at": self.loaded_at,
+            "startup": self.startup,
+            "latency": self.latency.summary(),
+            "shadow": shadow
+        }
+
+
+class ModelRegistry:
+    """Keeps several model versions loaded and switches between them without downtime.
+
+    New versions are loaded and warmed up on a background thread, then made
+    visible with a single reference assignment. A request resolves its
+    version once and keeps that object, so requests in flight during a swap
+    finish on the version they started with. Requests can pin a loaded
+    version by name, and a candidate can shadow-score a share of traffic in
+    the background without affecting responses.
+
+    Every worker process has its own registry; ``watch`` picks up retrained
+    artifacts written into the active directory, so all workers converge on
+    the new files by themselves.
+
+    Besides the active, shadow and pinned versions (loaded on request, until
+    unloaded) only the ``keep_versions`` most recently loaded stay in memory,
+    so repeated hot reloads don't accumulate models. ``allow_legacy`` lets
+    pre-schema (schema 1) artifacts load; see ``load_artifacts``.
+    """
+
+    def __init__(self, shadow_workers=2, keep_versions=2, allow_legacy=False):
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._pinned = set()
+        self.keep_versions = keep_versions
+        self.allow_legacy = allow_legacy
+        self._loading = {}
+        self.active = None
+        self.shadow = None
+        self.shadow_fraction = 0.0
+        self._shadow_pool = ThreadPoolExecutor(max_workers=shadow_workers, thread_name_prefix="shadow")
+        self.watch_interval = 0
+        self._watcher = ProcessLocalThread(lambda: self._watch(self.watch_interval), "model-watch")
+
+    @staticmethod
+    def version_name(directory, artifacts_fingerprint):
+        return f"{os.path.basename(os.path.normpath(directory))}-{artifacts_fingerprint[:8]}"
+
+    def _load(self, directory, name=None):
+        timer = StartupTimer()
+        artifacts = load_artifacts(directory, timer=timer, allow_legacy=self.allow_legacy)
+        with timer.stage("warm-up prediction"):
+            warm_up(artifacts)
+        return ModelVersion(name or self.version_name(directory, artifacts.fingerprint), artifacts, timer.as_dict())
+
+    def _evict(self):
+        # Under self._lock: drop the oldest versions nothing refers to; requests in flight keep their object
+        keep = {self.active.name if self.active else None, self.shadow.name if self.shadow else None} | self._pinned
+        others = sorted((v for v in self._versions.values() if v.name not in keep),
+                        key=lambda v: v.loaded_at, reverse=True)
+        for version in others[self.keep_versions:]:
+            del self._versions[version.name]
+
+    def _add(self, version, activate=False, pin=False):
+        with self._lock:
+            self._versions[version.name] = version
+            if pin:
+                self._pinned.add(version.name)
+            if activate or self.active is None:
+                self.active = version
+            self._evict()
+
+    def load(self, directory, name=None, activate=True, pin=False):
+        """Load synchronously (used at startup) and optionally make it the active version.
+
+        ``pin`` keeps the version loaded until ``unload``, however many newer ones follow.
+        """
+        version = self._load(directory, name)
+        self._add(version, activate, pin)
+        return version
+
+    def load_async(self, directory, name=None, activate=False, pin=False):
+        """Load a version on a background thread; returns immediately."""
+        key = name or os.path.abspath(directory)
+
+        def run():
+            try:
+                self.load(directory, name, activate, pin)
+                self._set_loading(key, "loaded")
+            except Exception as e:
+                self._set_loading(key, f"failed: {e}")
+                print(f"Model load from {directory} failed: {e}", file=sys.stderr)
+
+        self._set_loading(key, "loading")
+        threading.Thread(target=run, name=f"model-load-{key}", daemon=True).start()
+        return key
+
+    def _set_loading(self, key, status):
+        with self._lock:
+            self._loading[key] = status
+
+    def names(self):
+        return list(self._versions)
+
+    def get(self, name):
+        return self._versions.get(name)
+
+    def activate(self, name):
+        with self._lock:
+            version = self._versions.get(name)
+            if version is None:
+                raise KeyError(name)
+            self.active = version
+            if self.shadow is version:
+                self.shadow = None
+            self._evict()
+        return version
+
+    def set_shadow(self, name, fraction):
+        if not name or fraction <= 0:
+            self.shadow, self.shadow_fraction = None, 0.0
+            return None
+        version = self._versions.get(name)
+        if version is None:
+            raise KeyError(name)
+        self.shadow, self.shadow_fraction = version, min(float(fraction), 1.0)
+        return version
+
+    def unload(self, name):
+        with self._lock:
+            version = self._versions.get(name)
+            if version is self.active:
+                raise ValueError("Cannot unload the active version")
+            if version is self.shadow:
+                self.shadow = None
+            self._versions.pop(name, None)
+            self._pinned.discard(name)
+
+    def resolve(self, pinned=None):
+        """Version for one request: the pinned one if given (KeyError if unknown), else active."""
+        if pinned:
+            version = self._versions.get(pinned)
+            if version is None:
+                raise KeyError(pinned)
+            return version
+        return self.active
+
+    def maybe_shadow(self, primary, raw_features, prediction):
+        """Score ``raw_features`` on the shadow version in the background for a share of requests."""
+        shadow = self.shadow
+        if shadow is None or shadow is primary or random.random() >= self.shadow_fraction:
+            return
+
+        def run():
+            start = time.perf_counter()
+            shadow_prediction = shadow.predictor.predict_one(raw_features)
+            shadow.record_shadow(time.perf_counter() - start, abs(shadow_prediction - prediction))
+
+        self._shadow_pool.submit(run)
+
+    def _watch(self, interval):
+        # A set that failed to load is skipped until its files change again
+        failed = None
+        while True:
+            time.sleep(interval)
+            active = self.active
+            try:
+                current = fingerprint(active.artifacts.source_paths)
+            except OSError:
+                continue  # Files mid-replace; look again next tick
+            if current in (active.fingerprint, failed):
+                continue
+            if not artifact_set_complete(active.directory, active.artifacts.source_stats):
+                continue  # A writer is still replacing files; wait for the whole set
+            try:
+                version = self._load(active.directory)
+                # Only swap if the files didn't change again while loading
+                if version.fingerprint == fingerprint(version.artifacts.source_paths):
+                    self._add(version, activate=self.active is active)
+                    print(f"Hot-reloaded model {version.name}", file=sys.stderr)
+            except Exception as e:
+                failed = current
+                print(f"Hot reload from {active.directory} failed, keeping {active.name}: {e}", file=sys.stderr)
+
+    def ensure_watching(self):
+        # Started in each server worker on its first request
+        if self.watch_interval > 0:
+            self._watcher.ensure_started()
+
+    def describe(self):
+        with self._lock:
+            loading = dict(self._loading)
+        return {
+            "active": self.active.name if self.active else None,
+            "shadow": {"name": self.shadow.name, "fraction": self.shadow_fraction} if self.shadow else None,
+            "loading": loading,
+            "versions": [version.describe() for version in self._versions.values()]
+        }
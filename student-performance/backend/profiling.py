@@ -0,0 +1,85 @@
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack at a fixed interval while it runs a request.
+
+    A helper thread reads the target thread's current frame every
+    ``interval`` seconds, so the profiled code runs unmodified (no tracing
+    hooks); the cost is one stack walk per sample. Results are collapsed
+    stacks (``outer;inner count``), the input format of flamegraph tools.
+    """
+
+    def __init__(self, thread_id=None, interval=0.001, max_depth=64):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+        self.started_at = None
+        self.duration = 0.0
+
+    @staticmethod
+    def _label(frame):
+        code = frame.f_code
+        return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(self._label(frame))
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+        return self
+
+    def collapsed(self):
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+    def top_functions(self, limit=20):
+        """Functions by samples where they were on top of the stack (self time)."""
+        own = Counter()
+        for stack, count in self.samples.items():
+            own[stack.rsplit(";", 1)[-1]] += count
+        total = sum(own.values()) or 1
+        return [{"function": name, "samples": count, "share": count / total} for name, count in own.most_common(limit)]
+
+
+class ProfileStore:
+    """The most recent request profiles, looked up by id."""
+
+    def __init__(self, max_profiles=50):
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+        self._profiles = OrderedDict()
+
+    def add(self, endpoint, profiler):
+        profile_id = uuid.uuid4().hex[:16]
+        with self._lock:
+            self._profiles[profile_id] = (endpoint, profiler)
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+        return profile_id
+
+    def get(self, profile_id):
+        with self._lock:
+            return self._profiles.get(profile_id)
@@ -0,0 +1,227 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from sqlalchemy import bindparam, column, create_engine, func, or_, select, table
+
+from features import categorical_mappings, numerical_features
+from student_storage import storage_categories
+
+
+# Student columns the model reads; each is the lowercased feature name
+feature_columns = {feature: feature.lower() for feature in numerical_features + list(categorical_mappings)}
+
+
+def student_table(name='student'):
+    # Lightweight table clause: raw stored values, nothing for worker processes to reflect or pickle
+    return table(name, column('id'), column('predicted_score'), column('model_version'), column('exam_score'),
+                 *[column(name) for name in feature_columns.values()])
+
+
+def stale_filter(students, version_name):
+    return or_(students.c.model_version.is_(None), students.c.model_version != version_name)
+
+
+def encode_stored(transformer, rows):
+    """Raw model matrix for stored student rows, whichever categorical storage mode they use."""
+    columns = {feature: np.array([row[name] for row in rows], dtype=np.float64 if feature in numerical_features else object)
+               for feature, name in feature_columns.items()}
+    for feature in categorical_mappings:
+        values = columns[feature]
+        if isinstance(values[0], str):
+            columns[feature] = transformer.encode_categorical(feature, values)
+        elif transformer.categories_[feature] == storage_categories[feature]:
+            # Code storage uses the transformer's own encoding: no re-encoding at all
+            columns[feature] = values.astype(np.int64)
+        else:
+            decoded = np.asarray(storage_categories[feature], dtype=object)[values.astype(np.int64)]
+            columns[feature] = transformer.encode_categorical(feature, decoded)
+    return transformer.encode_columns(columns)
+
+
+def stream_chunks(engine, query, chunk_size):
+    """Yield the rows of ``query`` (ordered by id) in lists of ``chunk_size``.
+
+    Uses a server-side cursor, so the result set is never held in memory.
+    SQLite can't commit writes while another connection has a read open, so
+    there each chunk is fetched with its own short keyset query instead.
+    """
+    if engine.dialect.name == 'sqlite':
+        id_column = query.selected_columns.id
+        last_id = None
+        while True:
+            page = query if last_id is None else query.where(id_column > last_id)
+            with engine.connect() as conn:
+                rows = conn.execute(page.limit(chunk_size)).mappings().all()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1]['id']
+    else:
+        with engine.connect() as conn:
+            result = conn.execution_options(yield_per=chunk_size).execute(query)
+            yield from result.mappings().partitions()
+
+
+def rescore_range(engine, predictor, transformer, version_name, start_id, end_id,
+                  chunk_size=5000, rows_per_second=None, table_name='student'):
+    """Rescore stale students with ``start_id <= id < end_id``; returns the number of rows updated.
+
+    Rows stream in ``chunk_size`` partitions (see ``stream_chunks``); each
+    partition is scored with one vectorized predict and written back
+    with one executemany UPDATE on a second connection, committed per chunk.
+    ``rows_per_second`` caps the pace so live traffic keeps its share of the
+    database and CPU.
+    """
+    students = student_table(table_name)
+    query = (select(students.c.id, *[students.c[name] for name in feature_columns.values()])
+             .where(students.c.id >= start_id, students.c.id < end_id, stale_filter(students, version_name))
+             .order_by(students.c.id))
+    update = (students.update()
+              .where(students.c.id == bindparam('row_id'))
+              .values(predicted_score=bindparam('score'), model_version=version_name))
+
+    updated = 0
+    for partition in stream_chunks(engine, query, chunk_size):
+        chunk_start = time.perf_counter()
+        scores = predictor.predict(encode_stored(transformer, partition))
+        with engine.begin() as write_conn:
+            write_conn.execute(update, [
+                {"row_id": row["id"], "score": score} for row, score in zip(partition, scores.tolist())
+            ])
+        updated += len(partition)
+
+        if rows_per_second:
+            time.sleep(max(0.0, len(partition) / rows_per_second - (time.perf_counter() - chunk_start)))
+    return updated
+
+
+# Per worker process: one engine and one loaded model, reused across id slices
+_worker_state = {}
+
+
+def _init_worker(database_url, artifact_dir, fingerprint):
+    from artifacts import load_artifacts
+
+    artifacts = load_artifacts(artifact_dir)
+    if artifacts.fingerprint != fingerprint:
+        raise RuntimeError(f"Artifacts in {artifact_dir} changed since the version was loaded")
+    _worker_state.update(engine=create_engine(database_url), artifacts=artifacts)
+
+
+def _rescore_slice(version_name, start_id, end_id, chunk_size, rows_per_second):
+    artifacts = _worker_state['artifacts']
+    return rescore_range(_worker_state['engine'], artifacts.predictor, artifacts.transformer, version_name,
+                         start_id, end_id, chunk_size, rows_per_second)
+
+
+class RescoreJob:
+    """Progress of one re-scoring run; the counters are updated as id slices finish."""
+
+    def __init__(self, version_name, total):
+        self.version_name = version_name
+        self.total = total
+        self.rescored = 0
+        self.started_at = time.time()
+        self.finished_at = None
+        self.error = None
+
+    @property
+    def status(self):
+        if self.error:
+            return "failed"
+        return "completed" if self.finished_at else "running"
+
+    def to_dict(self):
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return {
+            "model_version": self.version_name,
+            "status": self.status,
+            "total": self.total,
+            "rescored": self.rescored,
+            "progress": self.rescored / self.total if self.total else 1.0,
+            "rows_per_second": self.rescored / elapsed if elapsed else 0.0,
+            "elapsed_seconds": round(elapsed, 3),
+            "error": self.error
+        }
+
+
+def rescore_students(engine, version, processes=1, chunk_size=5000, rows_per_second=None,
+                     slice_size=None, job=None):
+    """Rescore every student whose stored score wasn't produced by ``version``.
+
+    The id range is cut into slices that are scored in this process or, with
+    ``processes > 1``, spread over a process pool (each worker maps the same
+    compiled-model cache and opens its own connections). Progress lives in
+    the rows themselves: ``model_version`` is written with each score, so an
+    interrupted run resumes by simply running again. ``rows_per_second`` is
+    the total budget, split evenly across the workers.
+    """
+    students = student_table()
+    with engine.connect() as conn:
+        total, min_id, max_id = conn.execute(
+            select(func.count(), func.min(students.c.id), func.max(students.c.id))
+            .where(stale_filter(students, version.name))
+        ).one()
+
+    job = job or RescoreJob(version.name, total)
+    job.total = total
+    if not total:
+        job.finished_at = time.time()
+        return job
+
+    slice_size = slice_size or chunk_size * 10
+    slices = [(start, min(start + slice_size, max_id + 1)) for start in range(min_id, max_id + 1, slice_size)]
+    processes = max(1, min(processes, len(slices)))
+    worker_rate = rows_per_second / processes if rows_per_second else None
+
+    try:
+        if processes == 1:
+            for start, end in slices:
+                job.rescored += rescore_range(engine, version.predictor, version.transformer, version.name,
+                                              start, end, chunk_size, worker_rate)
+        else:
+            url = engine.url.render_as_string(hide_password=False)
+            with ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(url, version.directory, version.fingerprint)
+            ) as pool:
+                futures = [pool.submit(_rescore_slice, version.name, start, end, chunk_size, worker_rate)
+                           for start, end in slices]
+                for future in as_completed(futures):
+                    job.rescored += future.result()
+    except Exception as e:
+        job.error = str(e)
+        raise
+    finally:
+        job.finished_at = time.time()
+    return job
+
+
+class RescoreRunner:
+    """At most one background re-scoring run per process, with its last status kept for polling."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.job = None
+
+    def start(self, engine, version, on_done=None, **options):
+        with self._lock:
+            if self.job is not None and self.job.status == "running":
+                return None
+            self.job = job = RescoreJob(version.name, total=0)
+
+        def run():
+            try:
+                rescore_students(engine, version, job=job, **options)
+            except Exception:
+                pass  # Recorded on the job
+            if on_done is not None:
+                on_done(job)
+
+        threading.Thread(target=run, name="rescore", daemon=True).start()
+        return job
@@ -0,0 +1,137 @@
+import json
+import math
+
+
+# Fixed histogram over the score range; out-of-range scores land in the edge bins
+HISTOGRAM_MIN = 0.0
+HISTOGRAM_MAX = 100.0
+HISTOGRAM_BINS = 20
+
+# Relative accuracy of the quantile sketch (1% of the true value)
+SKETCH_ACCURACY = 0.01
+
+
+class QuantileSketch:
+    """Mergeable log-bucketed quantile sketch (DDSketch style).
+
+    Every positive value is counted in bucket ``ceil(log_gamma(x))``, which
+    bounds the relative error of any quantile by ``accuracy``. Two sketches
+    merge by adding bucket counts, so partial aggregates can be combined.
+    """
+
+    def __init__(self, accuracy=SKETCH_ACCURACY, buckets=None, zero_count=0):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = dict(buckets or {})
+        self.zero_count = zero_count
+
+    @property
+    def count(self):
+        return self.zero_count + sum(self.buckets.values())
+
+    def add(self, value):
+        if value <= 0:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def merge(self, other):
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+
+    def quantile(self, q):
+        total = self.count
+        if total == 0:
+            return None
+        rank = q * (total - 1)
+
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                # Midpoint of the bucket in the relative-error sense
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def to_json(self):
+        return json.dumps({"zero": self.zero_count, "buckets": {str(k): v for k, v in self.buckets.items()}})
+
+    @classmethod
+    def from_json(cls, text, accuracy=SKETCH_ACCURACY):
+        if not text:
+            return cls(accuracy)
+        data = json.loads(text)
+        return cls(accuracy, {int(k): v for k, v in data["buckets"].items()}, data["zero"])
+
+
+class ScoreAggregate:
+    """Running count/mean/variance, fixed-bin histogram and quantile sketch of scores.
+
+    Updates are O(1) (Welford's algorithm for the moments) and aggregates can
+    be merged (Chan et al. for the moments, bucket-wise sums for the rest).
+    """
+
+    def __init__(self, count=0, mean=0.0, m2=0.0, min_score=None, max_score=None, histogram=None, sketch=None):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.min_score = min_score
+        self.max_score = max_score
+        self.histogram = list(histogram) if histogram else [0] * HISTOGRAM_BINS
+        self.sketch = sketch or QuantileSketch()
+
+    @staticmethod
+    def bin_index(score):
+        width = (HISTOGRAM_MAX - HISTOGRAM_MIN) / HISTOGRAM_BINS
+        index = int((score - HISTOGRAM_MIN) // width)
+        return min(max(index, 0), HISTOGRAM_BINS - 1)
+
+    def add(self, score):
+        score = float(score)
+        self.count += 1
+        delta = score - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (score - self.mean)
+        self.min_score = score if self.min_score is None else min(self.min_score, score)
+        self.max_score = score if self.max_score is None else max(self.max_score, score)
+        self.histogram[self.bin_index(score)] += 1
+        self.sketch.add(score)
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.min_score = other.min_score if self.min_score is None else min(self.min_score, other.min_score)
+        self.max_score = other.max_score if self.max_score is None else max(self.max_score, other.max_score)
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+        self.sketch.merge(other.sketch)
+
+    @property
+    def variance(self):
+        # Sample variance, like pandas/numpy with ddof=1
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def summary(self, quantiles=(0.1, 0.25, 0.5, 0.75, 0.9)):
+        width = (HISTOGRAM_MAX - HISTOGRAM_MIN) / HISTOGRAM_BINS
+        return {
+            "count": self.count,
+            "mean": self.mean if self.count else None,
+            "variance": self.variance,
+            "std": math.sqrt(self.variance),
+            "min": self.min_score,
+            "max": self.max_score,
+            "histogram": {
+                "bin_edges": [HISTOGRAM_MIN + i * width for i in range(HISTOGRAM_BINS + 1)],
+                "counts": self.histogram
+            },
+            "quantiles": {str(q): self.sketch.quantile(q) for q in quantiles}
+        }
@@ -0,0 +1,146 @@
+import sys
+
+from sqlalchemy import SmallInteger, String, inspect, text, type_coerce
+from sqlalchemy.types import TypeDecorator
+
+from features import category_aliases, categorical_mappings
+
+
+# How the Student categoricals are stored: 'string' (the original VARCHARs) or
+# 'code' (small integers)
+CATEGORICAL_STORAGE_MODES = ('string', 'code')
+
+# Stored codes use the sorted order the feature transformer encodes with, so a
+# stored code is already the model input for that feature
+storage_categories = {feature: sorted(values) for feature, values in categorical_mappings.items()}
+storage_codes = {
+    feature: {value: code for code, value in enumerate(values)}
+    for feature, values in storage_categories.items()
+}
+
+
+class CategoryCode(TypeDecorator):
+    """A categorical feature stored as a SMALLINT code but read and written as its string.
+
+    Queries, filters and inserts keep using the API values ("High",
+    "Post Graduate", ...); only the column holds the code.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, feature):
+        super().__init__()
+        self.feature = feature
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, int):
+            return value
+        value = category_aliases.get(self.feature, {}).get(value, value)
+        try:
+            return storage_codes[self.feature][value]
+        except KeyError:
+            raise ValueError(f"Invalid value '{value}' for {self.feature}. "
+                             f"Must be one of {categorical_mappings[self.feature]}")
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else storage_categories[self.feature][int(value)]
+
+
+def categorical_column_type(feature, mode):
+    if mode not in CATEGORICAL_STORAGE_MODES:
+        raise ValueError(f"Unknown categorical storage mode '{mode}'. Must be one of {CATEGORICAL_STORAGE_MODES}")
+    return CategoryCode(feature) if mode == 'code' else String(20)
+
+
+def stored_code(column):
+    """Select expression for the raw stored code of a ``CategoryCode`` column (no decoding)."""
+    return type_coerce(column, SmallInteger)
+
+
+def _column_mode(table_info):
+    return 'string' if isinstance(table_info['type'], String) else 'code'
+
+
+def migrate_categoricals(engine, table, to='code', batch_size=10000, log=sys.stderr):
+    """Convert the categorical columns of ``table`` between string and code storage in place.
+
+    Per column: add a temporary column, fill it in id-range batches with a
+    CASE mapping, then drop the old column and rename the new one. Indexes
+    that cover the column are dropped first and recreated at the end. The
+    steps are idempotent, so an interrupted migration can simply be rerun.
+    Values that don't map (typos in old rows) abort the migration before
+    anything is dropped.
+    """
+    if to not in CATEGORICAL_STORAGE_MODES:
+        raise ValueError(f"Unknown categorical storage mode '{to}'")
+
+    columns = [feature.lower() for feature in categorical_mappings]
+    inspector = inspect(engine)
+    existing = {info['name']: info for info in inspector.get_columns(table.name)}
+
+    # Finish columns an earlier run dropped but didn't get to rename (MySQL DDL isn't transactional)
+    for column in columns:
+        if column not in existing and f"{column}__new" in existing:
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table.name} RENAME COLUMN {column}__new TO {column}"))
+            existing[column] = existing.pop(f"{column}__new")
+
+    pending = [column for column in columns if column in existing and _column_mode(existing[column]) != to]
+    if not pending:
+        # An interrupted run may have dropped indexes it didn't get to recreate
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+        print(f"{table.name}: categoricals already stored as {to}", file=log)
+        return
+
+    # SQLite can't drop an indexed column; MySQL would silently narrow the index
+    for index in inspector.get_indexes(table.name):
+        if set(index['column_names']) & set(pending):
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP INDEX {index['name']}" + (f" ON {table.name}" if engine.dialect.name == 'mysql' else "")))
+
+    new_type = 'SMALLINT' if to == 'code' else 'VARCHAR(20)'
+    with engine.connect() as conn:
+        max_id = conn.execute(text(f"SELECT MAX(id) FROM {table.name}")).scalar() or 0
+
+    for column in pending:
+        feature = next(feature for feature in categorical_mappings if feature.lower() == column)
+        temp = f"{column}__new"
+        if temp not in existing:
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {temp} {new_type}"))
+
+        # CASE over the (few) categories; aliases map to the canonical code too
+        pairs = [(value, code) for value, code in storage_codes[feature].items()]
+        pairs += [(alias, storage_codes[feature][canonical])
+                  for alias, canonical in category_aliases.get(feature, {}).items()]
+        if to == 'code':
+            cases = " ".join(f"WHEN '{value}' THEN {code}" for value, code in pairs)
+        else:
+            cases = " ".join(f"WHEN {code} THEN '{value}'" for value, code in storage_codes[feature].items())
+
+        for start in range(0, max_id + 1, batch_size):
+            with engine.begin() as conn:
+                conn.execute(text(
+                    f"UPDATE {table.name} SET {temp} = CASE {column} {cases} END "
+                    f"WHERE id >= :start AND id < :end AND {temp} IS NULL"
+                ), {"start": start, "end": start + batch_size})
+
+        with engine.connect() as conn:
+            unmapped = conn.execute(text(
+                f"SELECT id, {column} FROM {table.name} WHERE {temp} IS NULL AND {column} IS NOT NULL LIMIT 5"
+            )).fetchall()
+        if unmapped:
+            raise ValueError(f"{column}: values with no {to} mapping, e.g. {[tuple(row) for row in unmapped]}; "
+                             f"fix them and rerun")
+
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE {table.name} DROP COLUMN {column}"))
+            conn.execute(text(f"ALTER TABLE {table.name} RENAME COLUMN {temp} TO {column}"))
+            if engine.dialect.name == 'mysql':
+                conn.execute(text(f"ALTER TABLE {table.name} MODIFY {column} {new_type} NOT NULL"))
+        print(f"{table.name}.{column}: stored as {to}", file=log)
+
+    for index in table.indexes:
+        index.create(engine, checkfirst=True)
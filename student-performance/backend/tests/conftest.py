@@ -0,0 +1,133 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# The backend modules are imported flat, as app.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from features import categorical_mappings, feature_order, numerical_features, scaled_features, scaled_index  # noqa: E402
+
+
+# Plausible ranges for synthetic students (roughly the training data's)
+numerical_ranges = {
+    "Hours_Studied": (1, 44), "Attendance": (60, 100), "Sleep_Hours": (4, 10),
+    "Previous_Scores": (50, 100), "Tutoring_Sessions": (0, 8), "Physical_Activity": (0, 6),
+}
+
+
+def synthetic_students(rng, n):
+    """API-style student records (feature name -> value)."""
+    students = []
+    for _ in range(n):
+        student = {feature: float(rng.integers(low, high + 1)) for feature, (low, high) in numerical_ranges.items()}
+        for feature, values in categorical_mappings.items():
+            student[feature] = values[rng.integers(len(values))]
+        students.append(student)
+    return students
+
+
+def exam_score(student):
+    # A simple ground truth for the synthetic labels
+    return (40 + 0.4 * student["Hours_Studied"] + 0.2 * student["Attendance"] + 0.1 * student["Previous_Scores"]
+            + 2 * categorical_mappings["Motivation_Level"].index(student["Motivation_Level"]))
+
+
+def create_student_table(engine, rows=()):
+    """Student table with the columns rescoring/incremental read; ``rows`` are student records."""
+    from sqlalchemy import Column, Float, Integer, MetaData, String, Table
+
+    metadata = MetaData()
+    students = Table(
+        "student", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("predicted_score", Float),
+        Column("model_version", String(64)),
+        Column("exam_score", Float),
+        *[Column(feature.lower(), Float) for feature in numerical_features],
+        *[Column(feature.lower(), String(20)) for feature in categorical_mappings],
+    )
+    metadata.create_all(engine)
+    insert_students(engine, students, rows)
+    return students
+
+
+def insert_students(engine, students, rows, labelled=True):
+    if not rows:
+        return
+    with engine.begin() as conn:
+        conn.execute(students.insert(), [
+            {**{feature.lower(): value for feature, value in row.items()},
+             "exam_score": exam_score(row) if labelled else None}
+            for row in rows
+        ])
+
+
+def scale(X, scaler):
+    scaled = X.copy()
+    scaled[:, scaled_index] = (scaled[:, scaled_index] - scaler.mean_) / scaler.scale_
+    return scaled
+
+
+def compile_fitted(rng, X, scaler, **params):
+    """Fit a GradientBoostingRegressor on raw rows ``X`` (scaled by ``scaler``) and compile it."""
+    from sklearn.ensemble import GradientBoostingRegressor
+
+    from compiled_model import CompiledGradientBoosting
+
+    y = X @ rng.normal(size=X.shape[1]) + rng.normal(size=len(X))
+    model = GradientBoostingRegressor(random_state=0, **params).fit(scale(X, scaler), y)
+    return model, CompiledGradientBoosting.from_estimators(model, scaler, feature_order, scaled_features)
+
+
+@pytest.fixture(scope="session")
+def artifact_dir(tmp_path_factory):
+    """A small trained model and transformer saved the way the training script does."""
+    import pandas as pd
+    from sklearn.ensemble import GradientBoostingRegressor
+
+    from features import StudentFeatureTransformer
+    from Student_Performance_Boost import save_artifacts
+
+    students = synthetic_students(np.random.default_rng(0), 500)
+    data = pd.DataFrame(students)
+    transformer = StudentFeatureTransformer().fit(data)
+    model = GradientBoostingRegressor(n_estimators=30, max_depth=3, random_state=0)
+    model.fit(transformer.transform(data), [exam_score(student) for student in students])
+
+    directory = tmp_path_factory.mktemp("artifacts") / "model"
+    directory.mkdir()
+    save_artifacts(str(directory), model, transformer, {"n_estimators": 30})
+    return str(directory)
+
+
+# Teacher allowed to manage models in the app fixture
+ADMIN = "admin@example.com"
+
+
+@pytest.fixture(scope="session")
+def app_module(artifact_dir, tmp_path_factory):
+    """app.py imported against a SQLite database and the ``artifact_dir`` model."""
+    import artifacts
+
+    database = tmp_path_factory.mktemp("db") / "students.db"
+    os.environ.update({"DATABASE_URL": f"sqlite:///{database}", "MODEL_WATCH_INTERVAL": "0", "MODEL_ADMINS": ADMIN})
+    # app.py reads the default artifact directory when it's imported
+    artifacts.ARTIFACT_DIR = artifact_dir
+    import app
+    return app
+
+
+@pytest.fixture
+def api(app_module):
+    """Test client and admin auth headers, with empty tables and prediction cache."""
+    from flask_jwt_extended import create_access_token
+
+    with app_module.app.app_context():
+        app_module.Student.query.delete()
+        app_module.ScoreDistribution.query.delete()
+        app_module.db.session.commit()
+        token = create_access_token(identity=ADMIN)
+    app_module.prediction_cache.clear()
+    return app_module.app.test_client(), {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from conftest import compile_fitted, scale
+from features import feature_order, scaled_index
+
+
+@pytest.fixture(scope="module")
+def rng():
+    return np.random.default_rng(0)
+
+
+def random_raw(rng, n_rows):
+    # Raw model rows: non-negative numerical/derived columns, integer category codes
+    X = rng.integers(0, 3, size=(n_rows, len(feature_order))).astype(np.float64)
+    X[:, scaled_index] = rng.uniform(0, 100, size=(n_rows, len(scaled_index)))
+    return X
+
+
+def test_predict_is_bit_identical_to_sklearn(rng):
+    X = random_raw(rng, 500)
+    scaler = SimpleNamespace(mean_=X[:, scaled_index].mean(axis=0), scale_=X[:, scaled_index].std(axis=0))
+    model, compiled = compile_fitted(rng, X, scaler, n_estimators=50, max_depth=4, subsample=0.8)
+
+    # Fresh rows, plus rows sitting exactly on the folded split thresholds
+    X_new = random_raw(rng, 300)
+    splits = compiled.left != np.arange(compiled.left.size)
+    on_threshold = X_new[:50].copy()
+    on_threshold[np.arange(50), compiled.feature[splits][:50]] = compiled.threshold[splits][:50]
+    X_new = np.vstack([X_new, on_threshold])
+
+    expected = model.predict(scale(X_new, scaler))
+
+    assert np.array_equal(compiled.predict(X_new), expected)
+    assert [compiled.predict_one(row) for row in X_new] == expected.tolist()
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from artifacts import load_artifacts
+from conftest import synthetic_students
+from drift import DriftMonitor, binned_ks, build_baseline, drift_status, psi
+from features import feature_index
+
+
+@pytest.fixture(scope="module")
+def model(artifact_dir):
+    return load_artifacts(artifact_dir)
+
+
+def encoded(model, seed, n, **shift):
+    """Raw model rows and predictions for ``n`` synthetic students, numerical features shifted by ``shift``."""
+    data = pd.DataFrame(synthetic_students(np.random.default_rng(seed), n))
+    for feature, amount in shift.items():
+        data[feature] += amount
+    raw = model.transformer.encode(data)
+    return raw, model.predictor.predict(raw)
+
+
+@pytest.fixture(scope="module")
+def baseline(model):
+    raw, predictions = encoded(model, 5, 2000)
+    return build_baseline(model.transformer, raw, predictions)
+
+
+def monitor_for(baseline, rows, predictions, **options):
+    # A long interval keeps the background flush out of the way; report() flushes itself
+    monitor = DriftMonitor(baseline, interval=3600, **options)
+    for features, prediction in zip(rows, predictions):
+        monitor.record(features, prediction)
+    return monitor
+
+
+def test_psi_and_ks_of_known_distributions():
+    assert psi([0.5, 0.5], [0.5, 0.5]) == 0.0
+    assert psi([0.5, 0.5], [0.25, 0.75]) == pytest.approx(0.25 * np.log(2) + 0.25 * np.log(1.5))
+    # Empty bins are floored, so the score stays finite
+    assert np.isfinite(psi([0.5, 0.5, 0.0], [0.0, 0.5, 0.5]))
+    assert binned_ks([0.5, 0.5], [0.25, 0.75]) == 0.25
+    assert binned_ks([0.2, 0.3, 0.5], [0.2, 0.3, 0.5]) == 0.0
+
+
+@pytest.mark.parametrize("score, status", [(0.0, "stable"), (0.1, "moderate"), (0.2499, "moderate"), (0.25, "significant")])
+def test_drift_status_thresholds(score, status):
+    assert drift_status(score) == status
+
+
+def test_batched_moments_match_numpy(model, baseline):
+    raw, predictions = encoded(model, 6, 300)
+    monitor = monitor_for(baseline, raw[:100], predictions[:100])
+    # Three flushes of different sizes are merged into one set of moments
+    monitor.flush()
+    for features, prediction in zip(raw[100:], predictions[100:]):
+        monitor.record(features, prediction)
+        if len(monitor._pending) == 150:
+            monitor.flush()
+
+    report = monitor.report()
+
+    assert report["count"] == 300
+    hours = raw[:, feature_index["Hours_Studied"]]
+    assert report["features"]["Hours_Studied"]["mean"] == pytest.approx(hours.mean())
+    assert report["features"]["Hours_Studied"]["std"] == pytest.approx(hours.std())
+    assert report["prediction"]["mean"] == pytest.approx(predictions.mean())
+    assert report["prediction"]["std"] == pytest.approx(predictions.std())
+
+
+def test_shifted_inputs_are_flagged_and_unshifted_ones_are_not(model, baseline):
+    raw, predictions = encoded(model, 7, 1000)
+    stable = monitor_for(baseline, raw, predictions).report()
+    raw, predictions = encoded(model, 7, 1000, Hours_Studied=15)
+    shifted = monitor_for(baseline, raw, predictions).report()
+
+    assert {scores["status"] for scores in stable["features"].values()} == {"stable"}
+    assert stable["prediction"]["status"] == "stable"
+    assert shifted["features"]["Hours_Studied"]["status"] == "significant"
+    assert shifted["features"]["Hours_Studied"]["ks"] > 0.25
+    assert shifted["features"]["Hours_Studied"]["mean_shift"] > 1
+    assert shifted["features"]["Motivation_Level"]["status"] == "stable"
+
+
+def test_oldest_pending_rows_are_dropped_past_max_pending(model, baseline):
+    raw, predictions = encoded(model, 8, 8)
+    monitor = monitor_for(baseline, raw, predictions, max_pending=5)
+
+    report = monitor.report()
+
+    assert report["count"] == 5
+    assert report["prediction"]["mean"] == pytest.approx(predictions[3:].mean())
+
+
+def test_reset_starts_over(model, baseline):
+    raw, predictions = encoded(model, 9, 10)
+    monitor = monitor_for(baseline, raw, predictions)
+    monitor.report()
+
+    monitor.reset()
+
+    report = monitor.report()
+    assert (report["count"], report["features"], report["prediction"]) == (0, {}, None)
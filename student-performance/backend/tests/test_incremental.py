@@ -0,0 +1,81 @@
+import json
+import os
+import shutil
+
+import joblib
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+
+from conftest import create_student_table, insert_students, synthetic_students
+from incremental import STATE_FILE, default_out_dir, update_model
+
+
+@pytest.fixture
+def model_dir(artifact_dir, tmp_path):
+    # A private copy: updates may write next to it
+    directory = tmp_path / "model"
+    shutil.copytree(artifact_dir, directory)
+    return str(directory)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'students.db'}")
+
+
+def quiet(message):
+    pass
+
+
+def test_repeated_updates_only_read_new_rows(model_dir, engine):
+    rng = np.random.default_rng(1)
+    students = create_student_table(engine, synthetic_students(rng, 100))
+
+    first = update_model(engine, model_dir, n_new_stages=5, min_rows=10, holdout=0, log=quiet)
+    out_dir = default_out_dir(model_dir)
+    assert (first["first_student_id"], first["last_student_id"], first["rows"]) == (1, 100, 100)
+    assert (first["stages_before"], first["stages_after"]) == (30, 35)
+    assert json.load(open(os.path.join(out_dir, STATE_FILE)))["last_student_id"] == 100
+    # The live directory is left alone
+    assert joblib.load(os.path.join(model_dir, "gb_model.pkl")).n_estimators_ == 30
+
+    assert update_model(engine, model_dir, n_new_stages=5, min_rows=10, holdout=0, log=quiet) is None
+
+    insert_students(engine, students, synthetic_students(rng, 40))
+    second = update_model(engine, model_dir, n_new_stages=5, min_rows=10, holdout=0, log=quiet)
+    assert (second["first_student_id"], second["last_student_id"], second["rows"]) == (101, 140, 40)
+    # Continues from the first update's model, not the original one
+    assert (second["stages_before"], second["stages_after"]) == (35, 40)
+    state = json.load(open(os.path.join(out_dir, STATE_FILE)))
+    assert state["last_student_id"] == 140
+    assert [update["last_student_id"] for update in state["updates"]] == [100, 140]
+
+
+def test_holdout_rows_are_fitted_by_the_next_update(model_dir, engine):
+    create_student_table(engine, synthetic_students(np.random.default_rng(2), 100))
+    out_dir = os.path.join(os.path.dirname(model_dir), "out")
+
+    report = update_model(engine, model_dir, out_dir, n_new_stages=5, min_rows=10, holdout=0.2, log=quiet)
+    assert report["accepted"]
+    assert (report["rows"], report["holdout_rows"], report["last_student_id"]) == (80, 20, 80)
+
+    report = update_model(engine, model_dir, out_dir, n_new_stages=5, min_rows=10, holdout=0, log=quiet)
+    assert (report["first_student_id"], report["last_student_id"]) == (81, 100)
+
+
+def test_update_that_hurts_holdout_is_not_written(model_dir, engine):
+    rng = np.random.default_rng(3)
+    students = create_student_table(engine)
+    noisy = synthetic_students(rng, 80)
+    insert_students(engine, students, noisy)
+    # Fit rows labelled with noise, held-out rows with the true scores
+    with engine.begin() as conn:
+        conn.execute(students.update().values(exam_score=students.c.exam_score + 40 * (students.c.id % 2) - 20))
+    insert_students(engine, students, synthetic_students(rng, 20))
+    out_dir = os.path.join(os.path.dirname(model_dir), "out")
+
+    report = update_model(engine, model_dir, out_dir, n_new_stages=50, min_rows=10, holdout=0.2, log=quiet)
+    assert not report["accepted"]
+    assert report["mae_holdout_after"] > report["mae_holdout_before"]
+    assert not os.path.exists(out_dir)
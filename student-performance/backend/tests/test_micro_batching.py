@@ -0,0 +1,113 @@
+import threading
+
+import numpy as np
+import pytest
+
+from conftest import synthetic_students
+from micro_batching import MicroBatcher
+
+
+def doubled(items):
+    return [item * 2 for item in items]
+
+
+def test_results_fan_out_to_each_callers_future():
+    sizes = []
+    batcher = MicroBatcher(doubled, max_batch=4, max_wait=0.2, on_batch=lambda size, wait: sizes.append(size))
+
+    futures = [batcher.submit(i) for i in range(10)]
+
+    assert [future.result(timeout=5) for future in futures] == [i * 2 for i in range(10)]
+    assert sizes == [4, 4, 2]
+
+
+def test_exception_result_fails_only_its_item():
+    batcher = MicroBatcher(lambda items: [ValueError(item) if item < 0 else item for item in items], max_wait=0.05)
+
+    good, bad = batcher.submit(1), batcher.submit(-1)
+
+    assert good.result(timeout=5) == 1
+    with pytest.raises(ValueError):
+        bad.result(timeout=5)
+
+
+@pytest.mark.parametrize("failure", ["process_batch", "on_batch", "result_count"])
+def test_failing_batch_fails_its_callers_and_not_the_worker(failure):
+    # Only the first batch fails
+    failures = {failure}
+
+    def process(items):
+        if "process_batch" in failures:
+            failures.clear()
+            raise ZeroDivisionError
+        if "result_count" in failures:
+            failures.clear()
+            return []
+        return doubled(items)
+
+    def observe(size, wait):
+        if "on_batch" in failures:
+            failures.clear()
+            raise ZeroDivisionError
+
+    batcher = MicroBatcher(process, max_wait=0, on_batch=observe)
+
+    with pytest.raises((ZeroDivisionError, RuntimeError)):
+        batcher.submit(1).result(timeout=5)
+    assert batcher.submit(2).result(timeout=5) == 4
+
+
+def test_cancelled_item_is_not_processed():
+    started, release = threading.Event(), threading.Event()
+    seen = []
+
+    def process(items):
+        seen.extend(items)
+        started.set()
+        release.wait(5)
+        return items
+
+    batcher = MicroBatcher(process, max_wait=0)
+    running = batcher.submit("running")
+    started.wait(5)
+    cancelled, kept = batcher.submit("cancelled"), batcher.submit("kept")
+    assert cancelled.cancel()
+    release.set()
+
+    assert (running.result(timeout=5), kept.result(timeout=5)) == ("running", "kept")
+    assert seen == ["running", "kept"]
+
+
+@pytest.fixture
+def stalled_batcher(app_module, monkeypatch):
+    """Installs a batcher that doesn't answer within MICRO_BATCH_TIMEOUT."""
+    release = threading.Event()
+
+    def stall(items):
+        release.wait(5)
+        return [None] * len(items)
+
+    batcher = MicroBatcher(stall, max_wait=0)
+    monkeypatch.setitem(app_module.app.config, 'MICRO_BATCH_TIMEOUT', 0.05)
+    yield batcher
+    release.set()
+
+
+def test_predict_times_out_with_503(api, app_module, stalled_batcher, monkeypatch):
+    client, headers = api
+    monkeypatch.setattr(app_module, "prediction_batcher", stalled_batcher)
+
+    response = client.post('/predict', json=synthetic_students(np.random.default_rng(10), 1)[0], headers=headers)
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+
+
+def test_add_student_times_out_with_503(api, app_module, stalled_batcher, monkeypatch):
+    client, headers = api
+    monkeypatch.setattr(app_module, "write_batcher", stalled_batcher)
+    student = {feature.lower(): value for feature, value in synthetic_students(np.random.default_rng(11), 1)[0].items()}
+
+    response = client.post('/add_student', json={"name": "Late", **student}, headers=headers)
+
+    assert response.status_code == 503
@@ -0,0 +1,62 @@
+import shutil
+import time
+
+import pytest
+
+from artifacts import write_manifest
+from model_registry import ModelRegistry
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("timed out")
+        time.sleep(0.01)
+
+
+def replace_model(directory, source):
+    # What the training script does: new files, then the manifest
+    shutil.copy(source, directory / "gb_model.pkl")
+    write_manifest(str(directory), ["feature_transformer.pkl", "gb_model.pkl"])
+
+
+def test_failed_hot_reload_is_not_retried_until_the_files_change(artifact_dir, tmp_path, monkeypatch):
+    directory = tmp_path / "model"
+    shutil.copytree(artifact_dir, directory)
+    registry = ModelRegistry()
+    original = registry.load(str(directory))
+
+    loads = []
+    load = registry._load
+
+    def counting_load(*args):
+        loads.append(args)
+        return load(*args)
+
+    monkeypatch.setattr(registry, "_load", counting_load)
+    registry.watch_interval = 0.01
+    registry.ensure_watching()
+
+    broken = tmp_path / "broken.pkl"
+    broken.write_bytes(b"not a model")
+    replace_model(directory, broken)
+    wait_for(lambda: loads)
+    time.sleep(0.2)
+    assert len(loads) == 1
+    assert registry.active is original
+
+    replace_model(directory, f"{artifact_dir}/gb_model.pkl")
+    wait_for(lambda: registry.active is not original)
+    assert len(loads) == 2
+
+
+def test_async_load_status_is_reported(artifact_dir, tmp_path):
+    registry = ModelRegistry()
+    registry.load(artifact_dir)
+
+    key = registry.load_async(str(tmp_path), name="missing")
+
+    wait_for(lambda: registry.describe()["loading"][key] != "loading")
+    assert registry.describe()["loading"][key].startswith("failed: ")
+    assert registry.names() == [registry.active.name]
@@ -0,0 +1,51 @@
+import numpy as np
+
+from conftest import synthetic_students
+
+
+def test_invalid_rows_are_reported_by_index_and_the_rest_scored(api):
+    client, headers = api
+    students = synthetic_students(np.random.default_rng(1), 4)
+    students[1] = {**students[1], "Attendance": "lots"}
+    students[3] = {key: value for key, value in students[3].items() if key != "Motivation_Level"}
+
+    response = client.post('/predict_batch', json={"students": students}, headers=headers)
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body["total"], body["succeeded"], body["failed"]) == (4, 2, 2)
+    assert [error["index"] for error in body["errors"]] == [1, 3]
+    assert all(error["error"] for error in body["errors"])
+    # Each success carries its input index and the score /predict gives for that row
+    assert [result["index"] for result in body["results"]] == [0, 2]
+    for result in body["results"]:
+        single = client.post('/predict', json=students[result["index"]], headers=headers).get_json()
+        assert result["predicted_score"] == single["predicted_score"]
+
+
+def test_a_batch_of_only_invalid_rows_still_succeeds(api):
+    client, headers = api
+
+    response = client.post('/predict_batch', json=[{}, {"Hours_Studied": 3}], headers=headers)
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["results"] == []
+    assert [error["index"] for error in body["errors"]] == [0, 1]
+
+
+def test_oversized_batch_is_rejected(api, app_module, monkeypatch):
+    client, headers = api
+    monkeypatch.setattr(app_module, "MAX_BATCH_SIZE", 2)
+
+    response = client.post('/predict_batch', json=synthetic_students(np.random.default_rng(2), 3), headers=headers)
+
+    assert response.status_code == 413
+
+
+def test_payload_that_is_not_a_list_is_rejected(api):
+    client, headers = api
+
+    response = client.post('/predict_batch', json={"students": "none"}, headers=headers)
+
+    assert response.status_code == 400
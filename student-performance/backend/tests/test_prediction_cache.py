@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+import pytest
+
+import prediction_cache
+from prediction_cache import PredictionCache, feature_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(prediction_cache.time, "monotonic", clock)
+    return clock
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = PredictionCache(ttl=10)
+    cache.put("a", 1.0)
+
+    clock.now += 9.9
+    assert cache.get("a") == 1.0
+    clock.now += 0.1
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"], stats["size"]) == (1, 1, 1, 0)
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = PredictionCache(max_size=2)
+    cache.put("a", 1.0)
+    cache.put("b", 2.0)
+    cache.get("a")
+    cache.put("c", 3.0)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1.0, 3.0)
+    stats = cache.stats()
+    assert (stats["evictions"], stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 3, 1, 0.75)
+
+
+def test_changed_artifact_clears_the_cache_at_the_next_check(clock, tmp_path):
+    artifact = tmp_path / "gb_model.pkl"
+    artifact.write_bytes(b"model")
+    cache = PredictionCache(artifact_paths=[str(artifact)], check_interval=5)
+    cache.put("a", 1.0)
+
+    artifact.write_bytes(b"retrained model")
+    # Not re-checked until check_interval has passed
+    assert cache.get("a") == 1.0
+    clock.now += 5
+    assert cache.get("a") is None
+    assert cache.stats()["invalidations"] == 1
+
+    # An unchanged fingerprint keeps new entries
+    cache.put("b", 2.0)
+    clock.now += 5
+    assert cache.get("b") == 2.0
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_removed_artifact_counts_as_a_change(clock, tmp_path):
+    artifact = tmp_path / "gb_model.pkl"
+    artifact.write_bytes(b"model")
+    cache = PredictionCache(artifact_paths=[str(artifact)], check_interval=0)
+    cache.put("a", 1.0)
+
+    os.remove(artifact)
+
+    assert cache.get("a") is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_feature_key_treats_equal_vectors_alike():
+    assert feature_key(np.array([0.0, 1.5])) == feature_key(np.array([-0.0, 1.5]))
+    assert feature_key(np.array([1, 2])) == feature_key(np.array([1.0, 2.0]))
+    assert feature_key(np.array([1.0, 2.0])) != feature_key(np.array([2.0, 1.0]))
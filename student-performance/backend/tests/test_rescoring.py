@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, select
+
+from artifacts import load_artifacts
+from conftest import create_student_table, synthetic_students
+from rescoring import encode_stored, rescore_range, rescore_students
+
+
+@pytest.fixture
+def version(artifact_dir):
+    artifacts = load_artifacts(artifact_dir)
+    return SimpleNamespace(name="v2", predictor=artifacts.predictor, transformer=artifacts.transformer,
+                           directory=artifact_dir, fingerprint=artifacts.fingerprint)
+
+
+@pytest.fixture
+def students(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'students.db'}")
+    table = create_student_table(engine, synthetic_students(np.random.default_rng(4), 30))
+    return engine, table
+
+
+def stored(engine, table):
+    with engine.connect() as conn:
+        return conn.execute(select(table).order_by(table.c.id)).mappings().all()
+
+
+def test_rerun_rescores_only_the_rows_an_interrupted_run_missed(students, version):
+    engine, table = students
+    # An interrupted run got through ids 1-10
+    assert rescore_range(engine, version.predictor, version.transformer, version.name, 1, 11, chunk_size=4) == 10
+    with engine.begin() as conn:
+        conn.execute(table.update().where(table.c.id <= 10).values(predicted_score=-1.0))
+
+    job = rescore_students(engine, version, chunk_size=4, slice_size=7)
+
+    assert (job.status, job.total, job.rescored) == ("completed", 20, 20)
+    rows = stored(engine, table)
+    assert {row["model_version"] for row in rows} == {"v2"}
+    assert [row["predicted_score"] for row in rows[:10]] == [-1.0] * 10
+    expected = version.predictor.predict(encode_stored(version.transformer, rows[10:]))
+    np.testing.assert_array_equal([row["predicted_score"] for row in rows[10:]], expected)
+
+
+def test_rows_scored_by_another_version_are_stale(students, version):
+    engine, table = students
+    rescore_students(engine, version)
+    with engine.begin() as conn:
+        conn.execute(table.update().where(table.c.id.in_([3, 17])).values(model_version="v1"))
+
+    assert rescore_students(engine, version).rescored == 2
+    assert rescore_students(engine, version).total == 0
+
+
+def test_process_pool_scores_the_same_as_one_process(students, version, tmp_path):
+    engine, table = students
+    reference_engine = create_engine(f"sqlite:///{tmp_path / 'reference.db'}")
+    create_student_table(reference_engine, synthetic_students(np.random.default_rng(4), 30))
+
+    job = rescore_students(engine, version, processes=2, chunk_size=4, slice_size=8)
+    rescore_students(reference_engine, version)
+
+    assert job.rescored == 30
+    assert stored(engine, table) == stored(reference_engine, table)
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from conftest import synthetic_students
+
+
+@pytest.fixture
+def stored(api, app_module):
+    """40 stored students whose predicted scores take only 4 values, so pages split ties."""
+    students = synthetic_students(np.random.default_rng(3), 40)
+    with app_module.app.app_context():
+        app_module.db.session.add_all([
+            app_module.Student(name=f"student {i}", predicted_score=float(i % 4),
+                               **{feature.lower(): value for feature, value in student.items()})
+            for i, student in enumerate(students)
+        ])
+        app_module.db.session.commit()
+        rows = app_module.db.session.query(app_module.Student.id, app_module.Student.predicted_score).all()
+    return api, rows
+
+
+def pages(client, headers, **params):
+    pages, cursor = [], None
+    while True:
+        query = {**params, **({"cursor": cursor} if cursor else {})}
+        body = client.get('/students', query_string=query, headers=headers).get_json()
+        pages.append(body["students"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("sort, key", [
+    ("id", lambda row: row[0]),
+    ("predicted_score", lambda row: (row[1], row[0])),
+    ("-predicted_score", lambda row: (-row[1], -row[0])),
+])
+def test_cursors_visit_every_student_once_in_order(stored, sort, key):
+    (client, headers), rows = stored
+
+    result = pages(client, headers, sort=sort, limit=7, fields="predicted_score")
+
+    assert [len(page) for page in result] == [7] * 5 + [5]
+    seen = [(student["id"], student["predicted_score"]) for page in result for student in page]
+    # Equal scores are ordered by id, in the sort's direction
+    assert seen == sorted(rows, key=key)
+
+
+def test_exact_multiple_of_the_limit_ends_without_an_empty_page(stored):
+    (client, headers), rows = stored
+
+    result = pages(client, headers, limit=20)
+
+    assert [len(page) for page in result] == [20, 20]
+
+
+def test_cursor_from_another_sort_is_rejected(stored):
+    (client, headers), _ = stored
+    cursor = client.get('/students', query_string={"limit": 5}, headers=headers).get_json()["next_cursor"]
+
+    response = client.get('/students', query_string={"sort": "predicted_score", "cursor": cursor}, headers=headers)
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("params", [{"cursor": "not base64!"}, {"limit": 0}, {"sort": "name"}, {"fields": "password"}])
+def test_invalid_parameters_are_rejected(stored, params):
+    (client, headers), _ = stored
+
+    assert client.get('/students', query_string=params, headers=headers).status_code == 400
@@ -0,0 +1,99 @@
+import io
+
+import pytest
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, create_engine, inspect, select, text
+
+from features import categorical_mappings
+from student_storage import categorical_column_type, migrate_categoricals, storage_codes, stored_code
+
+
+def student_table(mode):
+    metadata = MetaData()
+    columns = [Column(feature.lower(), categorical_column_type(feature, mode)) for feature in categorical_mappings]
+    return Table("student", metadata, Column("id", Integer, primary_key=True), Column("name", String(100)), *columns,
+                 Index("ix_student_motivation_level", "motivation_level"))
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'students.db'}")
+
+
+def rows():
+    # Every category of every feature, plus the CSV alias "Postgraduate"
+    for i in range(3):
+        yield {"id": i + 1, "name": f"S{i}",
+               **{feature.lower(): values[i] for feature, values in categorical_mappings.items()}}
+    yield {"id": 4, "name": "alias", **{feature.lower(): values[0] for feature, values in categorical_mappings.items()},
+           "parental_education_level": "Postgraduate"}
+
+
+def test_migrate_categoricals_round_trip(engine):
+    strings = student_table("string")
+    strings.create(engine)
+    with engine.begin() as conn:
+        conn.execute(strings.insert(), list(rows()))
+    expected = [{**row, "parental_education_level": "Post Graduate"} if row["name"] == "alias" else row
+                for row in rows()]
+
+    migrate_categoricals(engine, student_table("code"), to="code", batch_size=2, log=io.StringIO())
+    stored = {info["name"]: info["type"] for info in inspect(engine).get_columns("student")}
+    assert all(isinstance(stored[feature.lower()], Integer) for feature in categorical_mappings)
+    with engine.connect() as conn:
+        # Raw codes in the table, the API strings through the code-mode column type
+        raw = conn.execute(select(stored_code(student_table("code").c.motivation_level)).order_by("id")).scalars().all()
+        decoded = [dict(row._mapping) for row in conn.execute(select(student_table("code")).order_by("id"))]
+    assert raw == [storage_codes["Motivation_Level"][row["motivation_level"]] for row in expected]
+    assert decoded == expected
+    assert "ix_student_motivation_level" in {index["name"] for index in inspect(engine).get_indexes("student")}
+
+    log = io.StringIO()
+    migrate_categoricals(engine, student_table("code"), to="code", log=log)
+    assert "already stored as code" in log.getvalue()
+
+    migrate_categoricals(engine, strings, to="string", batch_size=3, log=io.StringIO())
+    with engine.connect() as conn:
+        assert [dict(row._mapping) for row in conn.execute(select(strings).order_by("id"))] == expected
+
+
+def test_unmapped_value_aborts_before_anything_is_dropped(engine):
+    strings = student_table("string")
+    strings.create(engine)
+    with engine.begin() as conn:
+        conn.execute(strings.insert(), list(rows()))
+        conn.execute(strings.update().where(strings.c.id == 2).values(motivation_level="Extreme"))
+
+    with pytest.raises(ValueError, match="motivation_level"):
+        migrate_categoricals(engine, student_table("code"), to="code", log=io.StringIO())
+    stored = {info["name"]: info["type"] for info in inspect(engine).get_columns("student")}
+    assert isinstance(stored["motivation_level"], String)
+    with engine.connect() as conn:
+        assert conn.execute(select(strings.c.motivation_level).where(strings.c.id == 2)).scalar() == "Extreme"
+
+    # Fixing the row and rerunning completes the migration
+    with engine.begin() as conn:
+        conn.execute(strings.update().where(strings.c.id == 2).values(motivation_level="High"))
+    migrate_categoricals(engine, student_table("code"), to="code", log=io.StringIO())
+    with engine.connect() as conn:
+        values = conn.execute(select(student_table("code").c.motivation_level).order_by("id")).scalars().all()
+    assert values[1] == "High"
+
+
+def test_rerun_finishes_a_column_dropped_but_not_renamed(engine):
+    strings = student_table("string")
+    strings.create(engine)
+    with engine.begin() as conn:
+        conn.execute(strings.insert(), list(rows()))
+    migrate_categoricals(engine, student_table("code"), to="code", log=io.StringIO())
+
+    # State of a run interrupted between DROP COLUMN and RENAME COLUMN (MySQL DDL isn't transactional)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_student_motivation_level"))
+        conn.execute(text("ALTER TABLE student RENAME COLUMN motivation_level TO motivation_level__new"))
+
+    migrate_categoricals(engine, student_table("code"), to="code", log=io.StringIO())
+    assert "motivation_level__new" not in {info["name"] for info in inspect(engine).get_columns("student")}
+    assert "ix_student_motivation_level" in {index["name"] for index in inspect(engine).get_indexes("student")}
+    with engine.connect() as conn:
+        values = conn.execute(select(student_table("code").c.motivation_level).order_by("id")).scalars().all()
+    assert values == [row["motivation_level"] for row in rows()]
@@ -0,0 +1,52 @@
+import itertools
+import math
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from conftest import compile_fitted
+from features import feature_index, feature_order, scaled_features
+
+
+def brute_force_shapley(compiled, x, players):
+    """Shapley values over ``players`` with the path-dependent (cover-weighted) value function."""
+    def expectation(node, known):
+        if compiled.left[node] == node:
+            return compiled.value[node]
+        left, right = compiled.left[node], compiled.right[node]
+        feature = compiled.feature[node]
+        if feature in known:
+            return expectation(left if x[feature] <= compiled.threshold[node] else right, known)
+        return (compiled.cover[left] * expectation(left, known)
+                + compiled.cover[right] * expectation(right, known)) / compiled.cover[node]
+
+    def value(known):
+        return compiled.baseline + sum(expectation(root, known) for root in compiled.roots)
+
+    n = len(players)
+    phi = np.zeros(x.size)
+    for player in players:
+        others = [p for p in players if p != player]
+        for size in range(n):
+            weight = math.factorial(size) * math.factorial(n - size - 1) / math.factorial(n)
+            for subset in itertools.combinations(others, size):
+                phi[player] += weight * (value(set(subset) | {player}) - value(set(subset)))
+    return phi, value(set())
+
+
+def test_contributions_match_brute_force_shapley():
+    rng = np.random.default_rng(0)
+    # Only a few columns vary, so the exact Shapley sum over their subsets stays small
+    X = np.zeros((400, len(feature_order)))
+    players = [feature_index[f] for f in ("Hours_Studied", "Attendance", "Motivation_Level", "Tutoring_Effect")]
+    X[:, players] = rng.uniform(0, 10, size=(400, len(players)))
+    scaler = SimpleNamespace(mean_=np.zeros(len(scaled_features)), scale_=np.ones(len(scaled_features)))
+    _, compiled = compile_fitted(rng, X, scaler, n_estimators=10, max_depth=3)
+
+    for x in X[:5]:
+        expected, base = brute_force_shapley(compiled, x, players)
+        phi = compiled.contributions(x)
+        assert np.allclose(phi, expected, atol=1e-9)
+        assert compiled.expected_value == pytest.approx(base)
+        assert phi.sum() == pytest.approx(compiled.predict_one(x) - compiled.expected_value)
@@ -0,0 +1,252 @@
+import hashlib
+import json
+import math
+import os
+
+import joblib
+import numpy as np
+from joblib import Parallel, delayed
+from scipy.stats import loguniform, randint, uniform
+from sklearn.base import clone
+from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor
+from sklearn.metrics import r2_score
+from sklearn.model_selection import KFold, ParameterSampler
+
+
+# Search space; n_estimators is an upper bound, early stopping picks the real count
+default_param_distributions = {
+    'learning_rate': loguniform(0.01, 0.3),
+    'max_depth': randint(2, 9),
+    'min_samples_split': randint(2, 21),
+    'min_samples_leaf': randint(1, 11),
+    'subsample': uniform(0.6, 0.4),
+    'max_features': [None, 'sqrt', 0.5, 0.8],
+}
+
+
+def early_stopping_regressor(random_state=42, max_estimators=1000):
+    # Each fit holds out validation_fraction of its data and stops once the
+    # validation loss hasn't improved by tol for n_iter_no_change stages
+    return GradientBoostingRegressor(
+        n_estimators=max_estimators,
+        n_iter_no_change=10,
+        validation_fraction=0.1,
+        tol=1e-4,
+        random_state=random_state
+    )
+
+
+# Search space for the histogram engine; max_iter is an upper bound as above
+hist_param_distributions = {
+    'learning_rate': loguniform(0.01, 0.3),
+    'max_leaf_nodes': randint(7, 64),
+    'max_depth': [None, 3, 5, 8],
+    'min_samples_leaf': randint(5, 100),
+    'l2_regularization': loguniform(1e-4, 10),
+    'max_features': uniform(0.5, 0.5),
+}
+
+
+def early_stopping_hist_regressor(categorical_features, random_state=42, max_iter=1000):
+    # Histogram boosting bins every feature once up front and splits the
+    # categorical columns natively instead of treating their codes as ordered
+    return HistGradientBoostingRegressor(
+        max_iter=max_iter,
+        categorical_features=categorical_features,
+        early_stopping=True,
+        n_iter_no_change=10,
+        validation_fraction=0.1,
+        tol=1e-4,
+        random_state=random_state
+    )
+
+
+def n_boosting_stages(model):
+    # GradientBoostingRegressor reports n_estimators_, HistGradientBoostingRegressor n_iter_
+    return int(getattr(model, 'n_estimators_', None) or model.n_iter_)
+
+
+def _fit_and_score(key, estimator, params, X, y, train, test):
+    model = clone(estimator).set_params(**params)
+    model.fit(X[train], y[train])
+    return key, r2_score(y[test], model.predict(X[test])), n_boosting_stages(model)
+
+
+def _fit_all_rows(candidate, estimator, params, X, y):
+    return candidate, clone(estimator).set_params(**params).fit(X, y)
+
+
+def _to_json(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class SuccessiveHalvingSearch:
+    """Resumable successive-halving hyperparameter search.
+
+    ``n_candidates`` settings are sampled once (deterministically from
+    ``random_state``) and scored with ``cv``-fold R² on a growing share of the
+    training rows; after each rung only the best ``1 / factor`` survive, and
+    the last rung uses every row. All (candidate, fold) fits of a rung run in
+    parallel, each with early stopping.
+
+    The last rung's candidates are also fit on every row, in the same
+    parallel batch as their folds, and the winner's fit becomes
+    ``best_estimator_``: nothing is trained after the search, and the model
+    is meant to be used directly rather than trained again.
+
+    Every finished fit is appended to ``checkpoint_path`` (JSON lines), and
+    the all-row fits are saved next to it, so an interrupted search picks up
+    where it stopped. The checkpoint is keyed on a digest of the training
+    data too, and these files are removed once the search completes.
+    """
+
+    def __init__(self, estimator=None, param_distributions=None, n_candidates=64, factor=3,
+                 min_resources=200, cv=3, n_jobs=-1, random_state=42, checkpoint_path=None, verbose=1):
+        self.estimator = estimator if estimator is not None else early_stopping_regressor(random_state)
+        self.param_distributions = param_distributions or default_param_distributions
+        self.n_candidates = n_candidates
+        self.factor = factor
+        self.min_resources = min_resources
+        self.cv = cv
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.checkpoint_path = checkpoint_path
+        self.verbose = verbose
+
+    def _config_key(self, candidates, X, y):
+        # Same row count isn't enough: a retrain on different data must not restore old fits
+        data_digest = hashlib.sha1(np.ascontiguousarray(X).tobytes())
+        data_digest.update(np.ascontiguousarray(y).tobytes())
+        config = {
+            'estimator': repr(self.estimator),
+            'candidates': candidates,
+            'n_samples': len(y),
+            'data': data_digest.hexdigest(),
+            'factor': self.factor,
+            'min_resources': self.min_resources,
+            'cv': self.cv,
+            'random_state': self.random_state,
+        }
+        return hashlib.sha1(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _load_checkpoint(self, config_key):
+        # Returns {(rung, candidate, fold): (score, n_estimators)} from a previous run
+        # of the same search, writing a fresh checkpoint header otherwise
+        done = {}
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            self._append({'config': config_key})
+            return done
+        with open(self.checkpoint_path) as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        if not lines or lines[0].get('config') != config_key:
+            if self.verbose:
+                print(f"Checkpoint {self.checkpoint_path} is from a different search, starting over")
+            os.remove(self.checkpoint_path)
+            self._append({'config': config_key})
+            return done
+        for record in lines[1:]:
+            done[(record['rung'], record['candidate'], record['fold'])] = (record['score'], record['n_estimators'])
+        return done
+
+    def _append(self, record):
+        if not self.checkpoint_path:
+            return
+        with open(self.checkpoint_path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def fit(self, X, y):
+        X_input = X
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        n_samples = len(y)
+
+        candidates = [
+            {key: _to_json(value) for key, value in params.items()}
+            for params in ParameterSampler(self.param_distributions, self.n_candidates, random_state=self.random_state)
+        ]
+        n_rungs = max(1, math.ceil(math.log(len(candidates), self.factor)))
+        # Grow the sample budget geometrically so the last rung sees all rows
+        min_resources = min(n_samples, max(self.min_resources, n_samples // self.factor ** (n_rungs - 1)))
+        order = np.random.RandomState(self.random_state).permutation(n_samples)
+
+        config_key = self._config_key(candidates, X, y)
+        done = self._load_checkpoint(config_key)
+
+        def model_path(candidate):
+            return self.checkpoint_path and f"{self.checkpoint_path}.{config_key[:12]}.{candidate}.pkl"
+
+        self.cv_results_ = []
+        alive = list(range(len(candidates)))
+        full_models = {}
+        for rung in range(n_rungs):
+            n_resources = n_samples if rung == n_rungs - 1 else min(n_samples, min_resources * self.factor ** rung)
+            subset = order[:n_resources]
+            folds = list(KFold(self.cv, shuffle=True, random_state=self.random_state).split(subset))
+
+            pending = [
+                (candidate, fold) for candidate in alive for fold in range(self.cv)
+                if (rung, candidate, fold) not in done
+            ]
+            pending_full = []
+            if rung == n_rungs - 1:
+                for candidate in alive:
+                    path = model_path(candidate)
+                    if path and os.path.exists(path):
+                        full_models[candidate] = joblib.load(path)
+                    else:
+                        pending_full.append(candidate)
+            if self.verbose:
+                print(f"Rung {rung}: {len(alive)} candidates on {n_resources} samples "
+                      f"({len(alive) * self.cv - len(pending)} fits restored from checkpoint)")
+
+            X_rung, y_rung = X[subset], y[subset]
+            # Fitted on the caller's data so a DataFrame keeps its feature names
+            jobs = [
+                delayed(_fit_all_rows)(candidate, self.estimator, candidates[candidate], X_input, y)
+                for candidate in pending_full
+            ] + [
+                delayed(_fit_and_score)(
+                    (candidate, fold), self.estimator, candidates[candidate],
+                    X_rung, y_rung, folds[fold][0], folds[fold][1])
+                for candidate, fold in pending
+            ]
+            for result in Parallel(n_jobs=self.n_jobs, return_as='generator_unordered')(jobs):
+                if len(result) == 2:  # An all-row fit: (candidate, model)
+                    candidate, model = result
+                    full_models[candidate] = model
+                    if model_path(candidate):
+                        joblib.dump(model, model_path(candidate))
+                    continue
+                (candidate, fold), score, n_estimators = result
+                done[(rung, candidate, fold)] = (score, n_estimators)
+                self._append({'rung': rung, 'candidate': candidate, 'fold': fold,
+                              'score': score, 'n_estimators': n_estimators})
+
+            scores = {}
+            for candidate in alive:
+                fold_results = [done[(rung, candidate, fold)] for fold in range(self.cv)]
+                scores[candidate] = float(np.mean([score for score, _ in fold_results]))
+                self.cv_results_.append({
+                    'rung': rung, 'candidate': candidate, 'n_resources': n_resources,
+                    'params': candidates[candidate], 'mean_test_score': scores[candidate],
+                    'n_estimators': [n for _, n in fold_results]
+                })
+
+            keep = max(1, math.ceil(len(alive) / self.factor)) if rung < n_rungs - 1 else 1
+            alive = sorted(alive, key=lambda c: scores[c], reverse=True)[:keep]
+
+        best = alive[0]
+        self.best_index_ = best
+        self.best_params_ = candidates[best]
+        self.best_score_ = scores[best]
+        self.best_estimator_ = full_models[best]
+
+        # Finished: nothing left to resume, and stale files must not leak into a later search
+        for path in [self.checkpoint_path] + [model_path(candidate) for candidate in full_models]:
+            if path and os.path.exists(path):
+                os.remove(path)
+        return self
@@ -0,0 +1,91 @@
+import math
+
+import numpy as np
+
+from features import categorical_mappings, derived_features, feature_order, numerical_features
+
+
+WHAT_IF_MODES = ('independent', 'grid')
+
+
+def _perturbation_values(transformer, feature, spec, base):
+    """Absolute values of one feature's perturbations, as floats (numerical) or codes (categorical).
+
+    ``spec`` is a list of values, ``{"values": [...]}`` or, for numerical
+    features, ``{"delta": [...]}`` relative to the student's own value.
+    """
+    if feature in derived_features:
+        raise ValueError(f"{feature} is derived from other features; perturb its inputs instead")
+    if feature not in feature_order:
+        raise ValueError(f"Unknown feature '{feature}'. Must be one of {numerical_features + list(categorical_mappings)}")
+
+    if isinstance(spec, dict):
+        if set(spec) - {'values', 'delta'} or len(spec) != 1:
+            raise ValueError(f"Perturbation for {feature} must have exactly one of 'values' or 'delta'")
+        kind, values = next(iter(spec.items()))
+    else:
+        kind, values = 'values', spec
+    if not isinstance(values, list) or not values:
+        raise ValueError(f"Perturbation for {feature} must be a non-empty list")
+
+    if feature in categorical_mappings:
+        if kind == 'delta':
+            raise ValueError(f"{feature} is categorical; use 'values'")
+        return transformer.encode_categorical(feature, values).astype(np.float64)
+
+    try:
+        values = np.array([float(value) for value in values])
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid numeric perturbation for {feature}")
+    if not all(math.isfinite(value) for value in values):
+        raise ValueError(f"Invalid numeric perturbation for {feature}")
+    values = base + values if kind == 'delta' else values
+    # Same rule as validate_row: negative inputs make the derived features infinite or NaN
+    if (values < 0).any():
+        raise ValueError(f"Perturbation makes {feature} negative ({values.min():g}); it must stay non-negative")
+    return values
+
+
+def build_variants(transformer, encoded, perturbations, mode='independent', max_variants=10000):
+    """Model matrix for one student and its perturbed variants, plus each variant's changes.
+
+    Row 0 is the unchanged student. ``independent`` mode varies one feature
+    at a time; ``grid`` mode scores the cartesian product of all perturbed
+    features. Columns are filled with whole arrays and the derived features
+    recomputed by the transformer, so the grid is never built row by row.
+    """
+    if mode not in WHAT_IF_MODES:
+        raise ValueError(f"Invalid mode '{mode}'. Must be one of {list(WHAT_IF_MODES)}")
+    if not isinstance(perturbations, dict) or not perturbations:
+        raise ValueError("perturbations must be a non-empty object of feature -> values")
+
+    features = list(perturbations)
+    values = [_perturbation_values(transformer, feature, perturbations[feature], encoded.get(feature))
+              for feature in features]
+    sizes = [len(v) for v in values]
+    n_variants = sum(sizes) if mode == 'independent' else math.prod(sizes)
+    if n_variants > max_variants:
+        raise ValueError(f"Too many variants: {n_variants} (max {max_variants})")
+
+    columns = {feature: np.full(n_variants + 1, float(value)) for feature, value in encoded.items()}
+    if mode == 'independent':
+        # One block of rows per feature; every other column keeps the student's value
+        changes, offset = [], 1
+        for feature, feature_values in zip(features, values):
+            columns[feature][offset:offset + len(feature_values)] = feature_values
+            changes.extend({feature: value} for value in feature_values.tolist())
+            offset += len(feature_values)
+    else:
+        # Row-major index of every combination, same order as itertools.product
+        grid = np.indices(sizes).reshape(len(sizes), -1)
+        grid_values = [feature_values[index] for feature_values, index in zip(values, grid)]
+        for feature, feature_values in zip(features, grid_values):
+            columns[feature][1:] = feature_values
+        changes = [dict(zip(features, combination)) for combination in zip(*(v.tolist() for v in grid_values))]
+
+    # Categorical changes are reported as their category names, not codes
+    for change in changes:
+        for feature, value in change.items():
+            if feature in categorical_mappings:
+                change[feature] = transformer.categories_[feature][int(value)]
+    return transformer.encode_columns(columns), changes
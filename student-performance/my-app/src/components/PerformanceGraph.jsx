@@ -1,9 +1,49 @@
 import React from 'react'
 
-const PerformanceGraph = () => {
+const SIZE = 420;
+const CENTER = SIZE / 2;
+const RADIUS = 140;
+
+// Radar chart of the feature profile returned by /predict, drawn client-side as SVG
+const PerformanceGraph = ({ features = [], values = [] }) => {
+  if (!features.length || features.length !== values.length) {
+    return null;
+  }
+
+  const min = Math.min(0, ...values);
+  const max = Math.max(...values);
+  const span = max - min || 1;
+
+  const angleFor = (i) => (2 * Math.PI * i) / features.length - Math.PI / 2;
+  const pointFor = (i, r) => [
+    CENTER + r * Math.cos(angleFor(i)),
+    CENTER + r * Math.sin(angleFor(i)),
+  ];
+
+  const polygon = values
+    .map((value, i) => pointFor(i, ((value - min) / span) * RADIUS).join(","))
+    .join(" ");
+
   return (
-    <div>PerformanceGraph</div>
+    <svg viewBox={`0 0 ${SIZE} ${SIZE}`} className="max-w-md mx-auto h-auto">
+      {[0.25, 0.5, 0.75, 1].map((ring) => (
+        <circle key={ring} cx={CENTER} cy={CENTER} r={RADIUS * ring} fill="none" stroke="#e5e7eb" />
+      ))}
+      {features.map((feature, i) => {
+        const [x, y] = pointFor(i, RADIUS);
+        const [lx, ly] = pointFor(i, RADIUS + 30);
+        return (
+          <g key={feature}>
+            <line x1={CENTER} y1={CENTER} x2={x} y2={y} stroke="#e5e7eb" />
+            <text x={lx} y={ly} fontSize="10" textAnchor="middle" dominantBaseline="middle" fill="#374151">
+              {feature.replace(/_/g, " ")}
+            </text>
+          </g>
+        );
+      })}
+      <polygon points={polygon} fill="rgba(239, 68, 68, 0.25)" stroke="red" strokeWidth="2" />
+    </svg>
   )
 }
 
-export default PerformanceGraph
\ No newline at end of file
+export default PerformanceGraph
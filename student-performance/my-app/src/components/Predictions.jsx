@@ -1,5 +1,6 @@
 import { useState } from "react";
 import axios from "axios";
+import PerformanceGraph from "./PerformanceGraph";
 
 const categoricalOptions = {
   Parental_Involvement: ["Low", "Medium", "High"],
@@ -121,14 +122,10 @@ const Predictions = () => {
       )}
 
       {/* Graph Section */}
-      {prediction && prediction.prediction_graph && (
+      {prediction && prediction.radar && (
         <div className="max-w-4xl mx-auto mt-6 bg-white p-6 rounded-lg shadow-md">
-          <h3 className="text-xl font-semibold text-gray-800 mb-4 text-center">Prediction Graph</h3>
-          <img
-            src={prediction.prediction_graph}
-            alt="Prediction Graph"
-            className="max-w-md mx-auto h-auto rounded border"
-          />
+          <h3 className="text-xl font-semibold text-gray-800 mb-4 text-center">Numerical Feature Profile</h3>
+          <PerformanceGraph features={prediction.radar.features} values={prediction.radar.values} />
         </div>
       )}
     </div>